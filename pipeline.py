@@ -1,44 +1,62 @@
 import argparse
-import subprocess
-from pathlib import Path
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
-from src.extract.fbref_championship import run as run_fbref
-from src.extract.transfermarkt_championship import run as run_transfermarkt
-from src.transform.build_semantic_2024_25 import main as run_transform
-from src.load.load_curated_to_gbq import main as run_load
+from src.config import ensure_data_dirs
+
+# Stage modules (pandas, lxml, google-cloud, ...) are imported inside each
+# stage function so a single-stage run only pays for what it uses.
 
 
 def extract():
-    print("Extracting FBref...")
-    run_fbref()
-    print("Extracting Transfermarkt...")
-    run_transfermarkt()
+    """
+    Run the FBref and Transfermarkt extracts concurrently; the two sources
+    are independent, so the stage takes max(fbref, tm) rather than the sum.
+    """
+    from src.extract.fbref_championship import run as run_fbref
+    from src.extract.transfermarkt_championship import run as run_transfermarkt
+
+    print("Extracting FBref and Transfermarkt...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(run_fbref), executor.submit(run_transfermarkt)]
+        for future in futures:
+            future.result()
 
 
 def transform():
+    from src.transform.build_semantic_2024_25 import main as run_transform
+
     print("Transforming data...")
     run_transform()
 
 
 def load():
+    from src.load.load_curated_to_gbq import main as run_load
+
     print("Loading to BigQuery...")
     run_load()
 
 
 def reports():
     """
-    Run the notebook reporting script located at src/notebooks/run_notebooks.py.
+    Run the notebook reporting entrypoint in src/notebooks/run_notebooks.py
+    in-process, rather than spawning a second Python interpreter.
     """
-    script_path = Path("src") / "notebooks" / "run_notebooks.py"
-
-    if not script_path.exists():
+    try:
+        spec = importlib.util.find_spec("src.notebooks.run_notebooks")
+    except ModuleNotFoundError:
+        # find_spec imports the parent package, which may itself be missing
+        spec = None
+    if spec is None:
         print("No reporting script found at src/notebooks/run_notebooks.py.")
         return
 
+    from src.notebooks.run_notebooks import main as run_notebooks
+
     print("Running notebook reporting script...")
     try:
-        subprocess.run(["python", str(script_path)], check=True)
-    except subprocess.CalledProcessError as e:
+        run_notebooks()
+    except Exception as e:
         print(f"Notebook report generation failed: {e}")
 
 
@@ -60,6 +78,8 @@ def main():
 
     args = parser.parse_args()
 
+    ensure_data_dirs()
+
     if args.stage == "extract":
         extract()
     elif args.stage == "transform":
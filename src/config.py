@@ -19,6 +19,12 @@ BQ_DATASET = os.getenv("BQ_DATASET", "championship_2024_25")
 # If not set, ADC (gcloud auth application-default login) will be used.
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
+# ------------ Transfermarkt HTTP Cache ------------
+
+# Set TM_HTTP_CACHE=1 to keep fetched Transfermarkt pages on disk and
+# revalidate them with conditional GETs on later runs (local dev / CI retries).
+TM_HTTP_CACHE = os.getenv("TM_HTTP_CACHE") == "1"
+
 # ------------ Local Data Directories ------------
 
 def _resolve_data_dir(env_var_name: str, default_relative: str) -> Path:
@@ -41,5 +47,11 @@ def _resolve_data_dir(env_var_name: str, default_relative: str) -> Path:
 RAW_DATA_DIR = _resolve_data_dir("RAW_DATA_DIR", "data/raw")
 CURATED_DATA_DIR = _resolve_data_dir("CURATED_DATA_DIR", "data/curated")
 
-RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
-CURATED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+def ensure_data_dirs() -> None:
+    """
+    Create the local data directories. Called by the entry points at start-up
+    rather than as an import side effect.
+    """
+    RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    CURATED_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,12 +1,17 @@
-from functools import reduce
+import copy
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import lxml.html
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
+from lxml import etree
 
-from src.config import RAW_DATA_DIR, GCS_BUCKET
-from src.utils.gcp import upload_df_to_gcs
+from src.config import RAW_DATA_DIR, GCS_BUCKET, ensure_data_dirs
+from src.utils.gcp import upload_df_to_gcs, upload_dfs_to_gcs
 from src.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -19,6 +24,23 @@ FBREF_BASE_URL = "https://fbref.com"
 # Advanced tables
 ADVANCED_PLAYER_TABLES = ("passing", "shooting", "gca", "possession")
 
+# data-stat cells that hold text; every other cell is numeric and has its
+# thousands separators stripped at parse time
+TEXT_STATS = frozenset({"player", "nationality", "position", "team", "matches"})
+
+# Body rows minus the repeated header / spacer rows FBRef interleaves,
+# compiled once rather than re-parsed for every table
+BODY_ROWS_XPATH = etree.XPath(
+    "./tbody/tr[not(contains(@class, 'thead')) and not(contains(@class, 'spacer'))]"
+)
+
+# Containers kept when stream-parsing the standard stats page
+STANDARD_CONTAINER_IDS = (
+    "all_stats_standard",
+    "div_stats_squads_standard_for",
+    "stats_squads_standard_for",
+)
+
 # GCS layout for this extractor
 GCS_RAW_PREFIX = "fbref/championship_2024_25/raw"
 GCS_TRANSFORM_PREFIX = "fbref/championship_2024_25/transform"
@@ -26,7 +48,7 @@ GCS_TRANSFORM_PREFIX = "fbref/championship_2024_25/transform"
 
 # ---------- HTML loading ----------
 
-def load_fbref_html_from_file() -> str:
+def load_fbref_html_from_file() -> bytes:
     """
     Load the locally saved FBRef HTML snapshot.
 
@@ -44,12 +66,16 @@ def load_fbref_html_from_file() -> str:
         )
 
     logger.info(f"Loading FBRef HTML from {FBREF_HTML_PATH}")
-    return FBREF_HTML_PATH.read_text(encoding="utf-8")
+    # Raw bytes: lxml picks the encoding up from <meta charset>, so we skip
+    # a full-file decode into str
+    return FBREF_HTML_PATH.read_bytes()
 
 
-def load_fbref_html_for_table(table_type: str) -> str:
+@lru_cache(maxsize=8)
+def load_fbref_html_for_table(table_type: str) -> bytes:
     """
     Load the locally saved FBRef HTML snapshot for a given advanced player table.
+    Cached per table type, so repeated builds in one process read each file once.
 
     We expect filenames of the form:
         data/raw/html/fbref_championship_<table_type>_2024_25.html
@@ -63,414 +89,492 @@ def load_fbref_html_for_table(table_type: str) -> str:
         )
 
     logger.info("Loading FBRef %s HTML from %s", table_type, html_path)
-    return html_path.read_text(encoding="utf-8")
+    return html_path.read_bytes()
 
 
 # ---------- Table extraction helpers ----------
 
-def extract_player_table(html: str):
+def _parse_html(html: bytes, keep_ids: Iterable[str]):
     """
-    Player standard stats table lives inside div#all_stats_standard
-    as a commented-out <table>. Extract and return that <table>.
+    Stream-parse an FBRef HTML document once and return a small root holding
+    only the <div>/<table> elements whose id is in `keep_ids` (with their
+    subtrees), so every table extractor can share the same tree.
+
+    Everything else is cleared as soon as it has been parsed, keeping peak
+    memory to the kept containers instead of the full ~2MB DOM.
     """
-    soup = BeautifulSoup(html, "lxml")
+    keep_ids = set(keep_ids)
+    root = lxml.html.Element("html")
+    open_kept = 0
+
+    for event, elem in etree.iterparse(
+        io.BytesIO(html), events=("start", "end"), tag=("div", "table"), html=True
+    ):
+        kept = elem.get("id") in keep_ids
+        if event == "start":
+            open_kept += kept
+            continue
 
-    container = soup.find("div", id="all_stats_standard")
-    if container is None:
-        raise RuntimeError("Could not find div#all_stats_standard in FBRef HTML")
+        if kept:
+            open_kept -= 1
+            if open_kept == 0:
+                root.append(copy.deepcopy(elem))
 
-    table_comment = None
-    for c in container.find_all(string=lambda t: isinstance(t, Comment)):
-        if "<table" in c:
-            table_comment = c
-            break
+        if open_kept == 0:
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    return root
+
+
+def _cell_text(cell) -> str:
+    """
+    Whitespace-normalised text of an lxml element: every text node stripped
+    and joined with a single space (same as bs4's get_text(" ", strip=True)).
+    """
+    # Most stat cells are leaves holding a single text node
+    if len(cell) == 0:
+        return (cell.text or "").strip()
+    return " ".join(t.strip() for t in cell.itertext() if t.strip())
 
-    if table_comment is None:
-        raise RuntimeError("No commented <table> found inside div#all_stats_standard")
 
-    inner_soup = BeautifulSoup(table_comment, "lxml")
-    table = inner_soup.find("table")
+def _find_commented_table(container):
+    """
+    Return the first <table> hidden inside an HTML comment below `container`,
+    or None if there is no such comment.
+    """
+    for comment in container.xpath(".//comment()"):
+        if comment.text and "<table" in comment.text:
+            tables = lxml.html.fromstring(comment.text).xpath("descendant-or-self::table")
+            if tables:
+                return tables[0]
+    return None
+
+
+def extract_player_table(root):
+    """
+    Player standard stats table lives inside div#all_stats_standard
+    as a commented-out <table>. Extract and return that <table>.
+
+    `root` is the parsed document from _parse_html().
+    """
+    containers = root.xpath("//div[@id='all_stats_standard']")
+    if not containers:
+        raise RuntimeError("Could not find div#all_stats_standard in FBRef HTML")
+
+    table = _find_commented_table(containers[0])
     if table is None:
-        raise RuntimeError("Could not find <table> inside commented player block")
+        raise RuntimeError("No commented <table> found inside div#all_stats_standard")
 
     return table
 
 
-def extract_squad_table(html: str):
+def extract_squad_table(root):
     """
     Squad standard stats table is a direct <table> inside
     div#div_stats_squads_standard_for (not commented).
-    """
-    soup = BeautifulSoup(html, "lxml")
 
-    container = soup.find("div", id="div_stats_squads_standard_for")
-    if container is None:
-        table = soup.find("table", id=lambda v: v and "stats_squads_standard_for" in v)
-        if table is None:
+    `root` is the parsed document from _parse_html().
+    """
+    containers = root.xpath("//div[@id='div_stats_squads_standard_for']")
+    if not containers:
+        tables = root.xpath("//table[contains(@id, 'stats_squads_standard_for')]")
+        if not tables:
             raise RuntimeError(
                 "Could not find div#div_stats_squads_standard_for or "
                 "table with id containing 'stats_squads_standard_for' in FBRef HTML"
             )
-        return table
+        return tables[0]
 
-    table = container.find("table")
-    if table is None:
+    tables = containers[0].xpath(".//table")
+    if not tables:
         raise RuntimeError("div#div_stats_squads_standard_for has no <table>")
 
-    return table
+    return tables[0]
 
 
-def extract_advanced_player_table(html: str, table_type: str):
+def extract_advanced_player_table(root, table_type: str):
     """
     Extract the *player* table for an 'advanced' stats page
     (passing, shooting, gca, possession).
-    """
-    soup = BeautifulSoup(html, "lxml")
 
+    `root` is the parsed document from _parse_html().
+    """
     container_id = f"all_stats_{table_type}"
-    container = soup.find("div", id=container_id)
-    if container is None:
+    containers = root.xpath(f"//div[@id='{container_id}']")
+    if not containers:
         raise RuntimeError(f"Could not find div#{container_id} in FBRef HTML")
+    container = containers[0]
 
     # 1) Try commented-out table
-    table_comment = None
-    for c in container.find_all(string=lambda t: isinstance(t, Comment)):
-        if "<table" in c:
-            table_comment = c
-            break
-
-    if table_comment is not None:
-        inner_soup = BeautifulSoup(table_comment, "lxml")
-        table = inner_soup.find("table")
-        if table is not None:
-            return table
+    table = _find_commented_table(container)
+    if table is not None:
+        return table
 
     # 2) Fallback: direct table
-    table = container.find("table")
-    if table is None:
+    tables = container.xpath(".//table")
+    if not tables:
         raise RuntimeError(f"div#{container_id} has no <table> for table_type='{table_type}'")
 
-    return table
+    return tables[0]
 
 
 # ---------- Core parsing: PLAYER TABLE ----------
 
-def parse_player_standard_stats(table) -> pd.DataFrame:
+def _header_stats(table, label: str) -> List[str]:
+    """
+    Return the data-stat names of the last <thead> row, i.e. the table's
+    columns in display order.
+    """
+    columns = [th.get("data-stat") for th in table.xpath("./thead/tr[last()]/th")]
+    if not columns or not all(columns):
+        raise RuntimeError(f"{label} table has no usable <thead> data-stat header")
+    return columns
+
+
+def parse_player_standard_stats(
+    table,
+    rename_map: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
     """
     Parse the FBRef *player* standard stats <table> into a raw DataFrame.
+
+    Columns are named by data-stat; if `rename_map` is given it is applied
+    to those names as the frame is built, so no separate rename is needed.
     """
-    tbody = table.find("tbody")
-    if tbody is None:
+    if not table.xpath("./tbody"):
         raise RuntimeError("Player standard stats table has no <tbody>")
 
-    records: List[Dict[str, str]] = []
+    columns = _header_stats(table, "Player standard stats")
+    col_index = {stat: i for i, stat in enumerate(columns)}
+    if "player" not in col_index or "ranker" not in col_index:
+        raise RuntimeError("Player standard stats table has no player/ranker columns")
+    player_i = col_index["player"]
+    ranker_i = col_index["ranker"]
 
-    for tr in tbody.find_all("tr"):
-        cells = tr.find_all(["th", "td"])
-        if not cells:
-            continue
+    rows: List[Tuple[str, ...]] = []
 
-        row_data: Dict[str, str] = {}
-        for cell in cells:
+    for tr in BODY_ROWS_XPATH(table):
+        row = [""] * len(columns)
+        for cell in tr.iterchildren("th", "td"):
             stat = cell.get("data-stat")
-            if not stat:
+            i = col_index.get(stat)
+            if i is None:
                 continue
 
             if stat == "matches":
                 a = cell.find("a")
-                href = a.get("href") if a else ""
+                href = a.get("href", "") if a is not None else ""
                 if href and href.startswith("/"):
                     href = FBREF_BASE_URL + href
-                row_data[stat] = href
+                row[i] = href
+            elif stat in TEXT_STATS:
+                row[i] = _cell_text(cell)
             else:
-                text = cell.get_text(" ", strip=True)
-                row_data[stat] = text
+                row[i] = _cell_text(cell).replace(",", "")
 
-        player = row_data.get("player", "")
-        ranker = row_data.get("ranker", "")
-
-        if not player or not ranker.isdigit():
+        if not row[player_i] or not row[ranker_i].isdigit():
             continue
 
-        records.append(row_data)
+        rows.append(tuple(row))
 
-    if not records:
+    if not rows:
         raise RuntimeError("No player rows parsed from FBRef player standard stats table")
 
-    df = pd.DataFrame(records)
-    logger.info(
-        "Parsed raw FBRef player table with shape=%s and columns=%s",
-        df.shape,
-        list(df.columns),
-    )
+    if rename_map:
+        columns = [rename_map.get(c, c) for c in columns]
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    logger.info("Parsed raw FBRef player table with shape=%s", df.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw FBRef player columns=%s", list(df.columns))
     return df
 
 
 # ---------- Core parsing: SQUAD TABLE ----------
 
-def parse_squad_standard_stats(table) -> pd.DataFrame:
+def parse_squad_standard_stats(
+    table,
+    rename_map: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
     """
     Parse the FBRef *squad* standard stats <table> into a raw DataFrame.
+
+    Columns are named by data-stat; if `rename_map` is given it is applied
+    to those names as the frame is built, so no separate rename is needed.
     """
-    tbody = table.find("tbody")
-    if tbody is None:
+    if not table.xpath("./tbody"):
         raise RuntimeError("Squad standard stats table has no <tbody>")
 
-    records: List[Dict[str, str]] = []
+    columns = _header_stats(table, "Squad standard stats")
+    col_index = {stat: i for i, stat in enumerate(columns)}
+    if "team" not in col_index:
+        raise RuntimeError("Squad standard stats table has no team column")
+    team_i = col_index["team"]
 
-    for tr in tbody.find_all("tr"):
-        cells = tr.find_all(["th", "td"])
-        if not cells:
-            continue
+    rows: List[Tuple[str, ...]] = []
 
-        row_data: Dict[str, str] = {}
-        for cell in cells:
+    for tr in BODY_ROWS_XPATH(table):
+        row = [""] * len(columns)
+        for cell in tr.iterchildren("th", "td"):
             stat = cell.get("data-stat")
-            if not stat:
+            i = col_index.get(stat)
+            if i is None:
                 continue
-            text = cell.get_text(" ", strip=True)
-            row_data[stat] = text
+            text = _cell_text(cell)
+            row[i] = text if stat in TEXT_STATS else text.replace(",", "")
 
-        squad = row_data.get("team", "")
-        if not squad:
+        if not row[team_i]:
             continue
 
-        records.append(row_data)
+        rows.append(tuple(row))
 
-    if not records:
+    if not rows:
         raise RuntimeError("No squad rows parsed from FBRef squad standard stats table")
 
-    df = pd.DataFrame(records)
-    logger.info(
-        "Parsed raw FBRef squad table with shape=%s and columns=%s",
-        df.shape,
-        list(df.columns),
-    )
+    if rename_map:
+        columns = [rename_map.get(c, c) for c in columns]
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    logger.info("Parsed raw FBRef squad table with shape=%s", df.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw FBRef squad columns=%s", list(df.columns))
     return df
 
 
 # ---------- Cleaning & renaming: PLAYER DF ----------
 
+# FBRef data-stat -> output column; applied by the parser as the frame is built
+PLAYER_RENAME_MAP = {
+    "ranker": "rk",
+    "player": "player",
+    "nationality": "nation",
+    "position": "pos",
+    "team": "squad",
+    "age": "age",
+    "birth_year": "born",
+    "games": "mp",
+    "games_starts": "starts",
+    "minutes": "min",
+    "minutes_90s": "90s",
+    "goals": "gls",
+    "assists": "ast",
+    "goals_assists": "g+a",
+    "goals_pens": "g-pk",
+    "pens_made": "pk",
+    "pens_att": "pkatt",
+    "cards_yellow": "crdy",
+    "cards_red": "crdr",
+    "xg": "xg",
+    "npxg": "npxg",
+    "xg_assist": "xag",
+    "npxg_xg_assist": "npxg+xag",
+    "progressive_carries": "prgc",
+    "progressive_passes": "prgp",
+    "progressive_passes_received": "prgr",
+    "goals_per90": "p90_gls",
+    "assists_per90": "p90_ast",
+    "goals_assists_per90": "p90_g+a",
+    "goals_pens_per90": "p90_g-pk",
+    "goals_assists_pens_per90": "p90_g+a-pk",
+    "xg_per90": "p90_xg",
+    "xg_assist_per90": "p90_xag",
+    "xg_xg_assist_per90": "p90_xg+xag",
+    "npxg_per90": "p90_npxg",
+    "npxg_xg_assist_per90": "p90_npxg+xag",
+    "matches": "matches",
+}
+
+
+# Output column order; anything not listed is appended in source order
+PLAYER_COLUMN_ORDER = (
+    "rk",
+    "player",
+    "nation",
+    "pos",
+    "squad",
+    "age",
+    "born",
+    "mp",
+    "starts",
+    "min",
+    "90s",
+    "gls",
+    "ast",
+    "g+a",
+    "g-pk",
+    "pk",
+    "pkatt",
+    "crdy",
+    "crdr",
+    "xg",
+    "npxg",
+    "xag",
+    "npxg+xag",
+    "prgc",
+    "prgp",
+    "prgr",
+    "p90_gls",
+    "p90_ast",
+    "p90_g+a",
+    "p90_g-pk",
+    "p90_g+a-pk",
+    "p90_xg",
+    "p90_xag",
+    "p90_xg+xag",
+    "p90_npxg",
+    "p90_npxg+xag",
+    "matches",
+)
+PLAYER_COLUMN_SET = frozenset(PLAYER_COLUMN_ORDER)
+
+
+def _nation_code(raw) -> Optional[str]:
+    """Last whitespace-separated token, upper-cased ('eng ENG' -> 'ENG')."""
+    parts = str(raw).split()
+    return parts[-1].upper() if parts else None
+
+
 def tidy_player_df(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Clean and rename player-level FBRef stats.
-    """
-    rename_map = {
-        "ranker": "rk",
-        "player": "player",
-        "nationality": "nation",
-        "position": "pos",
-        "team": "squad",
-        "age": "age",
-        "birth_year": "born",
-        "games": "mp",
-        "games_starts": "starts",
-        "minutes": "min",
-        "minutes_90s": "90s",
-        "goals": "gls",
-        "assists": "ast",
-        "goals_assists": "g+a",
-        "goals_pens": "g-pk",
-        "pens_made": "pk",
-        "pens_att": "pkatt",
-        "cards_yellow": "crdy",
-        "cards_red": "crdr",
-        "xg": "xg",
-        "npxg": "npxg",
-        "xg_assist": "xag",
-        "npxg_xg_assist": "npxg+xag",
-        "progressive_carries": "prgc",
-        "progressive_passes": "prgp",
-        "progressive_passes_received": "prgr",
-        "goals_per90": "p90_gls",
-        "assists_per90": "p90_ast",
-        "goals_assists_per90": "p90_g+a",
-        "goals_pens_per90": "p90_g-pk",
-        "goals_assists_pens_per90": "p90_g+a-pk",
-        "xg_per90": "p90_xg",
-        "xg_assist_per90": "p90_xag",
-        "xg_xg_assist_per90": "p90_xg+xag",
-        "npxg_per90": "p90_npxg",
-        "npxg_xg_assist_per90": "p90_npxg+xag",
-        "matches": "matches",
-    }
-
-    df = df.rename(columns=rename_map)
-
+    Clean player-level FBRef stats. Expects the frame from
+    parse_player_standard_stats(..., rename_map=PLAYER_RENAME_MAP).
+    """
     if "nation" in df.columns:
-        df["nation"] = (
-            df["nation"]
-            .astype(str)
-            .str.strip()
-            .str.split()
-            .str[-1]
-            .str.upper()
-        )
+        # "eng ENG" -> "ENG"; one string op per distinct value, not per row
+        nation_codes = {raw: _nation_code(raw) for raw in df["nation"].unique()}
+        df["nation"] = df["nation"].map(nation_codes)
 
     non_numeric_cols = {"player", "nation", "pos", "squad", "matches"}
 
-    for col in df.columns:
-        if col in non_numeric_cols:
-            continue
-        df[col] = pd.to_numeric(
-            df[col].astype(str).str.replace(",", "", regex=False),
-            errors="coerce",
-        )
+    # Commas were already stripped at parse time
+    num_cols = [c for c in df.columns if c not in non_numeric_cols]
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
 
-    desired_order = [
-        "rk",
-        "player",
-        "nation",
-        "pos",
-        "squad",
-        "age",
-        "born",
-        "mp",
-        "starts",
-        "min",
-        "90s",
-        "gls",
-        "ast",
-        "g+a",
-        "g-pk",
-        "pk",
-        "pkatt",
-        "crdy",
-        "crdr",
-        "xg",
-        "npxg",
-        "xag",
-        "npxg+xag",
-        "prgc",
-        "prgp",
-        "prgr",
-        "p90_gls",
-        "p90_ast",
-        "p90_g+a",
-        "p90_g-pk",
-        "p90_g+a-pk",
-        "p90_xg",
-        "p90_xag",
-        "p90_xg+xag",
-        "p90_npxg",
-        "p90_npxg+xag",
-        "matches",
-    ]
-    ordered = [c for c in desired_order if c in df.columns]
-    remaining = [c for c in df.columns if c not in ordered]
+    ordered = [c for c in PLAYER_COLUMN_ORDER if c in df.columns]
+    remaining = [c for c in df.columns if c not in PLAYER_COLUMN_SET]
     df = df[ordered + remaining]
 
-    logger.info("Tidied FBRef player stats; final columns=%s", list(df.columns))
+    # Low-cardinality labels: dictionary-encoded in memory and in Parquet
+    for col in ("nation", "pos", "squad"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    logger.info("Tidied FBRef player stats; shape=%s", df.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tidied FBRef player columns=%s", list(df.columns))
     return df
 
 
 # ---------- Cleaning & renaming: SQUAD DF ----------
 
+# FBRef data-stat -> output column; applied by the parser as the frame is built
+SQUAD_RENAME_MAP = {
+    "team": "squad",
+    "players_used": "players",
+    "players": "players",
+    "avg_age": "age",
+    "possession": "poss",
+    "games": "mp",
+    "games_starts": "starts",
+    "minutes": "min",
+    "minutes_90s": "90s",
+    "goals": "gls",
+    "assists": "ast",
+    "goals_assists": "g+a",
+    "goals_pens": "g-pk",
+    "pens_made": "pk",
+    "pens_att": "pkatt",
+    "cards_yellow": "crdy",
+    "cards_red": "crdr",
+    "xg": "xg",
+    "npxg": "npxg",
+    "xg_assist": "xag",
+    "npxg_xg_assist": "npxg+xag",
+    "progressive_carries": "prgc",
+    "progressive_passes": "prgp",
+    "progressive_passes_received": "prgr",
+    "goals_per90": "p90_gls",
+    "assists_per90": "p90_ast",
+    "goals_assists_per90": "p90_g+a",
+    "goals_pens_per90": "p90_g-pk",
+    "goals_assists_pens_per90": "p90_g+a-pk",
+    "xg_per90": "p90_xg",
+    "xg_assist_per90": "p90_xag",
+    "xg_xg_assist_per90": "p90_xg+xag",
+    "npxg_per90": "p90_npxg",
+    "npxg_xg_assist_per90": "p90_npxg+xag",
+}
+
+
+# Output column order; anything not listed is appended in source order
+SQUAD_COLUMN_ORDER = (
+    "squad",
+    "players",
+    "age",
+    "poss",
+    "mp",
+    "starts",
+    "min",
+    "90s",
+    "gls",
+    "ast",
+    "g+a",
+    "g-pk",
+    "pk",
+    "pkatt",
+    "crdy",
+    "crdr",
+    "xg",
+    "npxg",
+    "xag",
+    "npxg+xag",
+    "prgc",
+    "prgp",
+    "prgr",
+    "p90_gls",
+    "p90_ast",
+    "p90_g+a",
+    "p90_g-pk",
+    "p90_g+a-pk",
+    "p90_xg",
+    "p90_xag",
+    "p90_xg+xag",
+    "p90_npxg",
+    "p90_npxg+xag",
+)
+SQUAD_COLUMN_SET = frozenset(SQUAD_COLUMN_ORDER)
+
+
 def tidy_squad_df(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Clean and rename squad-level FBRef stats.
-    """
-    rename_map = {
-        "team": "squad",
-        "players_used": "players",
-        "players": "players",
-        "avg_age": "age",
-        "possession": "poss",
-        "games": "mp",
-        "games_starts": "starts",
-        "minutes": "min",
-        "minutes_90s": "90s",
-        "goals": "gls",
-        "assists": "ast",
-        "goals_assists": "g+a",
-        "goals_pens": "g-pk",
-        "pens_made": "pk",
-        "pens_att": "pkatt",
-        "cards_yellow": "crdy",
-        "cards_red": "crdr",
-        "xg": "xg",
-        "npxg": "npxg",
-        "xg_assist": "xag",
-        "npxg_xg_assist": "npxg+xag",
-        "progressive_carries": "prgc",
-        "progressive_passes": "prgp",
-        "progressive_passes_received": "prgr",
-        "goals_per90": "p90_gls",
-        "assists_per90": "p90_ast",
-        "goals_assists_per90": "p90_g+a",
-        "goals_pens_per90": "p90_g-pk",
-        "goals_assists_pens_per90": "p90_g+a-pk",
-        "xg_per90": "p90_xg",
-        "xg_assist_per90": "p90_xag",
-        "xg_xg_assist_per90": "p90_xg+xag",
-        "npxg_per90": "p90_npxg",
-        "npxg_xg_assist_per90": "p90_npxg+xag",
-    }
-
-    df = df.rename(columns=rename_map)
-
+    Clean squad-level FBRef stats. Expects the frame from
+    parse_squad_standard_stats(..., rename_map=SQUAD_RENAME_MAP).
+    """
     non_numeric_cols = {"squad"}
 
-    for col in df.columns:
-        if col in non_numeric_cols:
-            continue
-        df[col] = pd.to_numeric(
-            df[col].astype(str).str.replace(",", "", regex=False),
-            errors="coerce",
-        )
+    # Commas were already stripped at parse time
+    num_cols = [c for c in df.columns if c not in non_numeric_cols]
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
 
-    desired_order = [
-        "squad",
-        "players",
-        "age",
-        "poss",
-        "mp",
-        "starts",
-        "min",
-        "90s",
-        "gls",
-        "ast",
-        "g+a",
-        "g-pk",
-        "pk",
-        "pkatt",
-        "crdy",
-        "crdr",
-        "xg",
-        "npxg",
-        "xag",
-        "npxg+xag",
-        "prgc",
-        "prgp",
-        "prgr",
-        "p90_gls",
-        "p90_ast",
-        "p90_g+a",
-        "p90_g-pk",
-        "p90_g+a-pk",
-        "p90_xg",
-        "p90_xag",
-        "p90_xg+xag",
-        "p90_npxg",
-        "p90_npxg+xag",
-    ]
-    ordered = [c for c in desired_order if c in df.columns]
-    remaining = [c for c in df.columns if c not in ordered]
+    ordered = [c for c in SQUAD_COLUMN_ORDER if c in df.columns]
+    remaining = [c for c in df.columns if c not in SQUAD_COLUMN_SET]
     df = df[ordered + remaining]
 
-    logger.info("Tidied FBRef squad stats; final columns=%s", list(df.columns))
+    logger.info("Tidied FBRef squad stats; shape=%s", df.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tidied FBRef squad columns=%s", list(df.columns))
     return df
 
 
 # ---------- Advanced player stats helpers ----------
 
 def _to_numeric(series: pd.Series) -> pd.Series:
-    """Convert a column to numeric, stripping commas; errors -> NaN."""
-    return pd.to_numeric(series.astype(str).str.replace(",", "", regex=False), errors="coerce")
+    """Convert a column to numeric (commas already stripped at parse time); errors -> NaN."""
+    return pd.to_numeric(series, errors="coerce")
 
 
 def extract_passing_features(df: pd.DataFrame, table_type: str = "passing") -> pd.DataFrame:
-    df_num = df.copy()
+    df_num = df[["player", "team", "passes_completed", "passes"]].copy()
     df_num["passes_completed"] = _to_numeric(df_num["passes_completed"])
     df_num["passes"] = _to_numeric(df_num["passes"])
 
@@ -481,7 +585,7 @@ def extract_passing_features(df: pd.DataFrame, table_type: str = "passing") -> p
 
 
 def extract_shooting_features(df: pd.DataFrame, table_type: str = "shooting") -> pd.DataFrame:
-    df_num = df.copy()
+    df_num = df[["player", "team", "shots"]].copy()
     df_num["shots"] = _to_numeric(df_num["shots"])
 
     out = df_num[["player", "team", "shots"]].rename(columns={"team": "squad"})
@@ -489,13 +593,17 @@ def extract_shooting_features(df: pd.DataFrame, table_type: str = "shooting") ->
 
 
 def extract_gca_features(df: pd.DataFrame, table_type: str = "gca") -> pd.DataFrame:
-    df_num = df.copy()
-    for col in ["sca", "sca_per90", "gca", "gca_per90"]:
-        if col not in df_num.columns:
+    num_cols = ["sca", "sca_per90", "gca", "gca_per90"]
+    for col in num_cols:
+        if col not in df.columns:
             raise RuntimeError(
                 f"Expected column '{col}' not found in FBRef '{table_type}' table. "
-                f"Available columns: {list(df_num.columns)}"
+                f"Available columns: {list(df.columns)}"
             )
+
+    # Only carry the columns we actually use
+    df_num = df[["player", "team", *num_cols]].copy()
+    for col in num_cols:
         df_num[col] = _to_numeric(df_num[col])
 
     out = df_num[["player", "team", "sca", "sca_per90", "gca", "gca_per90"]].rename(
@@ -509,13 +617,17 @@ def extract_gca_features(df: pd.DataFrame, table_type: str = "gca") -> pd.DataFr
 
 
 def extract_possession_features(df: pd.DataFrame, table_type: str = "possession") -> pd.DataFrame:
-    df_num = df.copy()
-    for col in ["touches", "miscontrols", "dispossessed", "take_ons", "take_ons_won"]:
-        if col not in df_num.columns:
+    num_cols = ["touches", "miscontrols", "dispossessed", "take_ons", "take_ons_won"]
+    for col in num_cols:
+        if col not in df.columns:
             raise RuntimeError(
                 f"Expected column '{col}' not found in FBRef '{table_type}' table. "
-                f"Available columns: {list(df_num.columns)}"
+                f"Available columns: {list(df.columns)}"
             )
+
+    # Only carry the columns we actually use
+    df_num = df[["player", "team", *num_cols]].copy()
+    for col in num_cols:
         df_num[col] = _to_numeric(df_num[col])
 
     df_num["failed_take_ons"] = df_num["take_ons"] - df_num["take_ons_won"]
@@ -534,39 +646,59 @@ ADVANCED_EXTRACTORS = {
 }
 
 
-def build_player_advanced_stats() -> pd.DataFrame:
+def _build_advanced_features(table_type: str) -> pd.DataFrame:
     """
-    Build the merged player advanced stats table and upload directly to GCS.
+    Load, parse and extract features for one advanced player table.
     """
-    feature_dfs: List[pd.DataFrame] = []
+    logger.info("Processing FBRef advanced player table: %s", table_type)
 
-    for table_type in ADVANCED_PLAYER_TABLES:
-        logger.info("Processing FBRef advanced player table: %s", table_type)
+    root = _parse_html(
+        load_fbref_html_for_table(table_type),
+        keep_ids=[f"all_stats_{table_type}"],
+    )
+    table = extract_advanced_player_table(root, table_type)
+    raw_df = parse_player_standard_stats(table)
 
-        html = load_fbref_html_for_table(table_type)
-        table = extract_advanced_player_table(html, table_type)
-        raw_df = parse_player_standard_stats(table)
+    extractor = ADVANCED_EXTRACTORS[table_type]
+    feat_df = extractor(raw_df, table_type=table_type)
 
-        extractor = ADVANCED_EXTRACTORS[table_type]
-        feat_df = extractor(raw_df, table_type=table_type)
+    logger.info("Extracted features for '%s'; shape=%s", table_type, feat_df.shape)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Feature columns for '%s'=%s", table_type, list(feat_df.columns))
+    return feat_df
 
-        logger.info(
-            "Extracted features for '%s'; shape=%s, columns=%s",
-            table_type,
-            feat_df.shape,
-            list(feat_df.columns),
-        )
-        feature_dfs.append(feat_df)
 
-    if not feature_dfs:
-        raise RuntimeError("No advanced feature DataFrames were built for player stats.")
+def merge_advanced_features(feature_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Outer-merge the per-table feature frames on (player, squad).
 
-    advanced_df = reduce(
+    A keyed merge rather than an index concat: FBRef can list the same name
+    twice within a squad, and concat cannot align a non-unique index.
+    """
+    return reduce(
         lambda left, right: pd.merge(left, right, on=["player", "squad"], how="outer"),
         feature_dfs,
     )
 
-    adv_blob = f"{GCS_TRANSFORM_PREFIX}/fbref_championship_player_advanced_stats_2024_25.csv"
+
+def build_player_advanced_stats() -> pd.DataFrame:
+    """
+    Build the merged player advanced stats table and upload directly to GCS.
+
+    The advanced pages are independent, so they are processed on a thread
+    pool (file reads and lxml parsing release the GIL).
+    """
+    with ThreadPoolExecutor(max_workers=len(ADVANCED_PLAYER_TABLES)) as executor:
+        feature_dfs: List[pd.DataFrame] = list(
+            executor.map(_build_advanced_features, ADVANCED_PLAYER_TABLES)
+        )
+
+    if not feature_dfs:
+        raise RuntimeError("No advanced feature DataFrames were built for player stats.")
+
+    advanced_df = merge_advanced_features(feature_dfs)
+
+    adv_blob = f"{GCS_TRANSFORM_PREFIX}/fbref_championship_player_advanced_stats_2024_25.parquet"
     upload_df_to_gcs(advanced_df, adv_blob)
 
     logger.info(
@@ -582,28 +714,21 @@ def build_player_advanced_stats() -> pd.DataFrame:
 
 # ---------- Main entrypoint ----------
 
-def run() -> pd.DataFrame:
+def _extract_standard_tables() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Main entrypoint:
-      - read local FBRef HTML snapshot
-      - parse BOTH squad and player standard stats tables
-      - clean & normalise each
-      - upload TWO CSVs to GCS:
-          * fbref_championship_player_standard_stats_2024_25.csv
-          * fbref_championship_squad_standard_stats_2024_25.csv
-      - also build advanced player stats and upload to:
-          * fbref_championship_player_advanced_stats_2024_25.csv
+    Parse, tidy and upload the player and squad standard stats tables.
     """
-    html = load_fbref_html_from_file()
+    # Parse the document once; both tables are pulled from the same tree
+    root = _parse_html(load_fbref_html_from_file(), keep_ids=STANDARD_CONTAINER_IDS)
 
     # Player table
-    player_table = extract_player_table(html)
-    raw_player_df = parse_player_standard_stats(player_table)
+    player_table = extract_player_table(root)
+    raw_player_df = parse_player_standard_stats(player_table, rename_map=PLAYER_RENAME_MAP)
     player_df = tidy_player_df(raw_player_df)
 
     # Squad table
-    squad_table = extract_squad_table(html)
-    raw_squad_df = parse_squad_standard_stats(squad_table)
+    squad_table = extract_squad_table(root)
+    raw_squad_df = parse_squad_standard_stats(squad_table, rename_map=SQUAD_RENAME_MAP)
     squad_df = tidy_squad_df(raw_squad_df)
 
     # Optional: keep local CSVs by uncommenting:
@@ -614,11 +739,10 @@ def run() -> pd.DataFrame:
     # squad_df.to_csv(squad_out, index=False)
 
     # Cloud-first: upload directly to GCS
-    player_blob = f"{GCS_RAW_PREFIX}/fbref_championship_player_standard_stats_2024_25.csv"
-    squad_blob = f"{GCS_RAW_PREFIX}/fbref_championship_squad_standard_stats_2024_25.csv"
+    player_blob = f"{GCS_RAW_PREFIX}/fbref_championship_player_standard_stats_2024_25.parquet"
+    squad_blob = f"{GCS_RAW_PREFIX}/fbref_championship_squad_standard_stats_2024_25.parquet"
 
-    upload_df_to_gcs(player_df, player_blob)
-    upload_df_to_gcs(squad_df, squad_blob)
+    upload_dfs_to_gcs([(player_df, player_blob), (squad_df, squad_blob)])
 
     logger.info(
         "FBRef standard stats extract complete. "
@@ -631,18 +755,40 @@ def run() -> pd.DataFrame:
         squad_blob,
     )
 
-    # Build and upload advanced player stats table
-    try:
-        adv_df = build_player_advanced_stats()
-        logger.info(
-            "FBRef advanced player stats extract complete. Players=%d",
-            len(adv_df),
-        )
-    except Exception:
-        logger.exception("Failed to build advanced player stats table.")
+    return player_df, squad_df
+
+
+def run() -> pd.DataFrame:
+    """
+    Main entrypoint:
+      - read local FBRef HTML snapshot
+      - parse BOTH squad and player standard stats tables
+      - clean & normalise each
+      - upload TWO Parquet files to GCS:
+          * fbref_championship_player_standard_stats_2024_25.parquet
+          * fbref_championship_squad_standard_stats_2024_25.parquet
+      - also build advanced player stats and upload to:
+          * fbref_championship_player_advanced_stats_2024_25.parquet
+    """
+    # The advanced tables come from separate pages, so build them in the
+    # background while the standard tables are parsed and uploaded
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        adv_future = executor.submit(build_player_advanced_stats)
+        player_df, squad_df = _extract_standard_tables()
+
+        # Wait for the advanced player stats table
+        try:
+            adv_df = adv_future.result()
+            logger.info(
+                "FBRef advanced player stats extract complete. Players=%d",
+                len(adv_df),
+            )
+        except Exception:
+            logger.exception("Failed to build advanced player stats table.")
 
     return player_df, squad_df
 
 
 if __name__ == "__main__":
+    ensure_data_dirs()
     run()
@@ -1,12 +1,21 @@
+import atexit
+import hashlib
+import json
 import time
+from pathlib import Path
 from typing import Tuple, List, Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
 
+import lxml.html
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from src.config import RAW_DATA_DIR, GCS_BUCKET
-from src.utils.gcp import upload_df_to_gcs
+from src.config import RAW_DATA_DIR, GCS_BUCKET, TM_HTTP_CACHE, ensure_data_dirs
+from src.utils.gcp import upload_dfs_to_gcs
 from src.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -20,7 +29,45 @@ HEADERS = {
 }
 
 REQUEST_TIMEOUT = 20
-REQUEST_DELAY = 2  # delay between requests (to respect robots.txt)
+REQUEST_DELAY = 2  # default delay between requests if robots.txt sets no Crawl-delay
+
+# One pooled keep-alive session for all Transfermarkt requests, so later
+# fetches reuse the TLS connection to the same host
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        # Transient errors/timeouts back off exponentially (2s, 4s, 8s, ...)
+        # instead of aborting the whole extract; Retry-After is honoured
+        max_retries=Retry(
+            total=5,
+            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    ),
+)
+atexit.register(_SESSION.close)
+
+# Per-origin polite delay (robots.txt Crawl-delay, else REQUEST_DELAY) and
+# time.monotonic() of the last request to that origin
+_crawl_delays: Dict[str, float] = {}
+_last_fetch_at: Dict[str, float] = {}
+
+# Transfermarkt serves UTF-8; lxml would otherwise guess Latin-1 for bytes
+# without a charset declaration
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Precompiled lookups evaluated per container or row
+HEADER_CELLS_XPATH = etree.XPath(".//*[self::th or self::td]")
+TABLE_ROWS_XPATH = etree.XPath(".//tr")
+ROW_CELLS_XPATH = etree.XPath(".//td")
+
+# On-disk page cache, only used when TM_HTTP_CACHE=1
+HTTP_CACHE_DIR = RAW_DATA_DIR / ".http_cache"
 
 # GCS prefix for Transfermarkt raw extracts
 GCS_RAW_PREFIX = "transfermarkt/championship_2024_25/raw"
@@ -28,16 +75,130 @@ GCS_RAW_PREFIX = "transfermarkt/championship_2024_25/raw"
 
 # ---------- Generic helpers ----------
 
-def fetch_html(url: str) -> str:
+def _http_cache_paths(url: str) -> Tuple[Path, Path]:
+    """(body, validators) cache file paths for a URL."""
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return HTTP_CACHE_DIR / f"{key}.html", HTTP_CACHE_DIR / f"{key}.headers.json"
+
+
+def _conditional_headers(url: str) -> Dict[str, str]:
+    """
+    If-None-Match / If-Modified-Since headers for a cached copy of `url`,
+    or {} when nothing usable is cached.
+    """
+    body_path, meta_path = _http_cache_paths(url)
+    if not body_path.exists() or not meta_path.exists():
+        return {}
+
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    headers: Dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _write_http_cache(url: str, resp: requests.Response) -> None:
+    """Store a 200 response body and its validators for later revalidation."""
+    body_path, meta_path = _http_cache_paths(url)
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    body_path.write_bytes(resp.content)
+    meta_path.write_text(
+        json.dumps(
+            {
+                "url": url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _crawl_delay(origin: str) -> float:
     """
-    Fetch HTML from a Transfermarkt URL with a polite delay.
+    Seconds to keep between requests to `origin`: the Crawl-delay robots.txt
+    advertises for our User-Agent, or REQUEST_DELAY if there is none or
+    robots.txt can't be read. Looked up once per origin.
+    """
+    if origin in _crawl_delays:
+        return _crawl_delays[origin]
+
+    delay = REQUEST_DELAY
+    robots_url = f"{origin}/robots.txt"
+    try:
+        resp = _SESSION.get(robots_url, timeout=REQUEST_TIMEOUT)
+        if resp.status_code == 200:
+            parser = RobotFileParser(robots_url)
+            parser.parse(resp.text.splitlines())
+            advertised = parser.crawl_delay(HEADERS["User-Agent"])
+            if advertised is not None:
+                delay = float(advertised)
+    except requests.RequestException as exc:
+        logger.warning("Could not read %s (%s); using %ss delay", robots_url, exc, delay)
+
+    logger.info("Using %ss delay between requests to %s", delay, origin)
+    _crawl_delays[origin] = delay
+    return delay
+
+
+def fetch_html(url: str) -> bytes:
+    """
+    Fetch the raw HTML bytes of a Transfermarkt URL with a polite delay.
     Transfermarkt robots.txt allows '/' for generic user-agents, so this is permitted.
+
+    Bytes go straight to lxml (HTML_PARSER), skipping requests' text decode.
+
+    The delay is the site's robots.txt Crawl-delay (REQUEST_DELAY if it has
+    none) and is kept *between* requests to the same host: we only wait for
+    whatever is left of it since the previous fetch, so work done in between
+    counts towards it and nothing sleeps after the last page.
+
+    With TM_HTTP_CACHE=1 pages are cached under RAW_DATA_DIR/.http_cache and
+    revalidated; a 304 Not Modified is served from disk.
     """
+    origin = _origin(url)
+    delay = _crawl_delay(origin)
+    if origin in _last_fetch_at:
+        wait = delay - (time.monotonic() - _last_fetch_at[origin])
+        if wait > 0:
+            time.sleep(wait)
+
+    headers = _conditional_headers(url) if TM_HTTP_CACHE else {}
+
     logger.info(f"Fetching {url}")
-    resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    try:
+        resp = _SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    finally:
+        _last_fetch_at[origin] = time.monotonic()
+
+    if headers and resp.status_code == 304:
+        logger.info("Not modified; using cached copy of %s", url)
+        body_path, _ = _http_cache_paths(url)
+        return body_path.read_bytes()
+
     resp.raise_for_status()
-    time.sleep(REQUEST_DELAY)
-    return resp.text
+    if TM_HTTP_CACHE:
+        _write_http_cache(url, resp)
+    return resp.content
+
+
+def _text(el) -> str:
+    """Stripped text nodes of `el` joined by single spaces."""
+    if len(el) == 0:
+        return (el.text or "").strip()
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _first(el, tag: str):
+    """First descendant of `el` with the given tag (document order), or None."""
+    return next(el.iterdescendants(tag), None)
 
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -54,29 +215,29 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
 
 def parse_bs_table_generic(table) -> pd.DataFrame:
     """
-    Generic HTML table -> DataFrame, used for the league table.
+    Generic HTML table (lxml element) -> DataFrame, used for the league table.
     """
     if table is None:
         return pd.DataFrame()
 
-    thead = table.find("thead")
-    tbody = table.find("tbody")
-    if not thead or not tbody:
+    thead = _first(table, "thead")
+    tbody = _first(table, "tbody")
+    if thead is None or tbody is None:
         return pd.DataFrame()
 
-    header_rows = thead.find_all("tr")
+    header_rows = TABLE_ROWS_XPATH(thead)
     if not header_rows:
         return pd.DataFrame()
 
-    header_cells = header_rows[-1].find_all(["th", "td"])
-    headers = [cell.get_text(" ", strip=True) for cell in header_cells]
+    header_cells = HEADER_CELLS_XPATH(header_rows[-1])
+    headers = [_text(cell) for cell in header_cells]
 
     rows: List[List[str]] = []
-    for tr in tbody.find_all("tr"):
-        cells = tr.find_all("td")
+    for tr in TABLE_ROWS_XPATH(tbody):
+        cells = ROW_CELLS_XPATH(tr)
         if not cells:
             continue
-        row = [cell.get_text(" ", strip=True) for cell in cells]
+        row = [_text(cell) for cell in cells]
 
         if len(row) < len(headers):
             row += [""] * (len(headers) - len(row))
@@ -95,71 +256,56 @@ def parse_bs_table_generic(table) -> pd.DataFrame:
 
 # ---------- League table parsing (div id="yw1") ----------
 
-def parse_league_table(html: str) -> pd.DataFrame:
+LEAGUE_COLUMNS = ("#", "club", "played", "w", "d", "l", "goals", "gd", "pts")
+
+
+def parse_league_table(html: bytes) -> pd.DataFrame:
     """
     Extract the Championship league table from the Transfermarkt 'tabelle' page.
     """
-    soup = BeautifulSoup(html, "lxml")
+    doc = lxml.html.fromstring(html, parser=HTML_PARSER)
 
-    holder = soup.find("div", id="yw1")
+    holders = doc.xpath("//div[@id='yw1']")
+    holder = holders[0] if holders else None
     if holder is None:
         raise ValueError("Could not find div with id='yw1' for league table")
 
-    table = holder.find("table")
+    table = _first(holder, "table")
     if table is None:
         raise ValueError("Could not find <table> inside div#yw1 for league table")
 
-    tbody = table.find("tbody")
+    tbody = _first(table, "tbody")
     if tbody is None:
         raise ValueError("Could not find <tbody> in league table")
 
-    records: List[dict] = []
+    # Column-wise lists; the DataFrame is built once at the end
+    columns: Dict[str, List[str]] = {name: [] for name in LEAGUE_COLUMNS}
 
-    for tr in tbody.find_all("tr"):
-        tds = tr.find_all("td")
+    for tr in TABLE_ROWS_XPATH(tbody):
+        tds = ROW_CELLS_XPATH(tr)
         if len(tds) < 10:
             continue  # skip weird/summary rows
 
         # rank: first number in the first cell
-        rank_text = tds[0].get_text(" ", strip=True)
+        rank_text = _text(tds[0])
         rank_token = rank_text.split()[0]
         if not rank_token.isdigit():
             continue  # skip anything that isn't a normal row
 
         # club name is in td[2], inside an <a>
-        club_a = tds[2].find("a")
-        club_name = (
-            club_a.get_text(" ", strip=True)
-            if club_a
-            else tds[2].get_text(" ", strip=True)
-        )
-
-        played = tds[3].get_text(" ", strip=True)
-        w = tds[4].get_text(" ", strip=True)
-        d = tds[5].get_text(" ", strip=True)
-        l = tds[6].get_text(" ", strip=True)
-        goals = tds[7].get_text(" ", strip=True)
-        goal_diff = tds[8].get_text(" ", strip=True)
-        pts = tds[9].get_text(" ", strip=True)
-
-        records.append(
-            {
-                "#": rank_token,
-                "club": club_name,
-                "played": played,
-                "w": w,
-                "d": d,
-                "l": l,
-                "goals": goals,
-                "gd": goal_diff,
-                "pts": pts,
-            }
-        )
+        club_a = _first(tds[2], "a")
+        club_name = _text(club_a) if club_a is not None else _text(tds[2])
 
-    if not records:
+        columns["#"].append(rank_token)
+        columns["club"].append(club_name)
+        # played, w, d, l, goals, gd, pts are td[3]..td[9] in order
+        for name, td in zip(LEAGUE_COLUMNS[2:], tds[3:10]):
+            columns[name].append(_text(td))
+
+    if not columns["#"]:
         raise ValueError("No data rows parsed from league table")
 
-    league_df = pd.DataFrame(records)
+    league_df = pd.DataFrame(columns)
 
     logger.info(
         "Parsed league table with columns=%s and shape=%s",
@@ -171,43 +317,68 @@ def parse_league_table(html: str) -> pd.DataFrame:
 
 # ---------- Transfers helpers ----------
 
-def get_club_name_for_container(container) -> Optional[str]:
+TRANSFERS_IN_COLUMNS = (
+    "Club",
+    "In",
+    "Age",
+    "Nationality",
+    "Position",
+    "Market value",
+    "Left",
+    "Fee",
+)
+TRANSFERS_OUT_COLUMNS = (
+    "Club",
+    "Out",
+    "Age",
+    "Nationality",
+    "Position",
+    "Market value",
+    "Joined",
+    "Fee",
+)
+
+
+def containers_with_club_names(doc) -> List[Tuple[object, str]]:
     """
-    For a given 'responsive-table' div, find the nearest preceding <h2>
-    (club header) and return its text.
+    Pair every 'responsive-table' div with the text of the nearest <h2>
+    (club header) before it, in a single document-order walk.
+    The club name is "" if there is no such header.
     """
-    h2 = container.find_previous("h2")
-    if h2:
-        text = h2.get_text(" ", strip=True)
-        if text:
-            return text
-    return None
+    pairs: List[Tuple[object, str]] = []
+    current_h2 = None
+    for el in doc.iter("h2", "div"):
+        if el.tag == "h2":
+            current_h2 = el
+        elif "responsive-table" in el.get("class", "").split():
+            pairs.append((el, _text(current_h2) if current_h2 is not None else ""))
+    return pairs
 
 
 def nat_from_td(td) -> str:
     """Get nationality from <img title=...> or alt in the nationality cell."""
     if td is None:
         return ""
-    img = td.find("img")
-    if img:
+    img = _first(td, "img")
+    if img is not None:
         return img.get("title") or img.get("alt") or ""
     return ""
 
 
-def parse_transfer_row(tr, club_name: str, in_or_out: str) -> Optional[Dict[str, str]]:
+def _transfer_row_values(tr) -> Optional[Tuple[str, ...]]:
     """
-    Parse a single <tr> for either an 'In' or 'Out' table.
+    Parse a single transfer <tr> into
+    (player, age, nationality, position, market value, other club, fee),
+    or None for header/summary rows.
     """
-    tds = tr.find_all("td")
+    tds = ROW_CELLS_XPATH(tr)
     if not tds:
         return None
 
     # Player is the first <td>, take first <a> text if present
     player_td = tds[0]
-    a = player_td.find("a")
-    player_name = (
-        a.get_text(" ", strip=True) if a else player_td.get_text(" ", strip=True)
-    )
+    a = _first(player_td, "a")
+    player_name = _text(a) if a is not None else _text(player_td)
     if not player_name:
         return None
     if "average age" in player_name.lower():
@@ -221,33 +392,29 @@ def parse_transfer_row(tr, club_name: str, in_or_out: str) -> Optional[Dict[str,
     fee = ""
 
     for td in tds:
-        classes = td.get("class", [])
+        classes = td.get("class", "").split()
 
         if "alter-transfer-cell" in classes:
-            age = td.get_text(" ", strip=True)
+            age = _text(td)
 
         elif "nat-transfer-cell" in classes:
             nat = nat_from_td(td)
 
         elif "kurzpos-transfer-cell" in classes:
             # short position code: CF, LW, etc.
-            pos = td.get_text(" ", strip=True)
+            pos = _text(td)
 
         elif "pos-transfer-cell" in classes and not pos:
             # fallback to long position if short missing
-            pos = td.get_text(" ", strip=True)
+            pos = _text(td)
 
         elif "mw-transfer-cell" in classes:
-            mv = td.get_text(" ", strip=True)
+            mv = _text(td)
 
         elif "verein-flagge-transfer-cell" in classes:
             # club name (Left/Joined)
-            club_a = td.find("a")
-            other_club = (
-                club_a.get_text(" ", strip=True)
-                if club_a
-                else td.get_text(" ", strip=True)
-            )
+            club_a = _first(td, "a")
+            other_club = _text(club_a) if club_a is not None else _text(td)
 
         elif (
             "rechts" in classes
@@ -255,77 +422,69 @@ def parse_transfer_row(tr, club_name: str, in_or_out: str) -> Optional[Dict[str,
             and "no-border" not in " ".join(classes)
         ):
             # fee cell: class 'rechts'
-            fee = td.get_text(" ", strip=True)
-
-    if in_or_out == "in":
-        return {
-            "Club": club_name,
-            "In": player_name,
-            "Age": age,
-            "Nationality": nat,
-            "Position": pos,
-            "Market value": mv,
-            "Left": other_club,
-            "Fee": fee,
-        }
-    else:
-        return {
-            "Club": club_name,
-            "Out": player_name,
-            "Age": age,
-            "Nationality": nat,
-            "Position": pos,
-            "Market value": mv,
-            "Joined": other_club,
-            "Fee": fee,
-        }
-
-
-def parse_transfers(html: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+            fee = _text(td)
+
+    return player_name, age, nat, pos, mv, other_club, fee
+
+
+def _transfers_frame(
+    clubs: List[str], rows: List[Tuple[str, ...]], columns: Tuple[str, ...]
+) -> pd.DataFrame:
+    """
+    Build an In/Out DataFrame from per-row value tuples; 'Club' repeats ~24
+    names, so it is stored as a categorical.
+    """
+    df = pd.DataFrame.from_records(rows, columns=list(columns[1:]))
+    df.insert(0, "Club", pd.Categorical(clubs))
+    return df
+
+
+def parse_transfers(html: bytes) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Extract Championship transfers from the Transfermarkt 'transfers' page.
 
     Returns:
       transfers_in_df, transfers_out_df
     """
-    soup = BeautifulSoup(html, "lxml")
+    doc = lxml.html.fromstring(html, parser=HTML_PARSER)
 
-    containers = soup.find_all("div", class_="responsive-table")
+    containers = containers_with_club_names(doc)
     logger.info(
         "Found %d div.responsive-table blocks on transfers page", len(containers)
     )
 
-    in_rows: List[Dict[str, str]] = []
-    out_rows: List[Dict[str, str]] = []
+    in_clubs: List[str] = []
+    in_rows: List[Tuple[str, ...]] = []
+    out_clubs: List[str] = []
+    out_rows: List[Tuple[str, ...]] = []
 
-    for idx_c, container in enumerate(containers):
-        table = container.find("table")
+    for idx_c, (container, club_name) in enumerate(containers):
+        table = _first(container, "table")
         if table is None:
             logger.debug("responsive-table %d has no <table>; skipping", idx_c)
             continue
 
-        club_name = get_club_name_for_container(container) or ""
         if not club_name:
             logger.debug(
                 "responsive-table %d has no detectable club header; skipping", idx_c
             )
             continue
 
-        thead = table.find("thead")
-        if not thead:
+        thead = _first(table, "thead")
+        if thead is None:
             logger.debug("responsive-table %d has no <thead>; skipping", idx_c)
             continue
 
-        header_row = thead.find_all("tr")[-1]
-        header_cells = header_row.find_all(["th", "td"])
+        header_row = TABLE_ROWS_XPATH(thead)[-1]
+        header_cells = HEADER_CELLS_XPATH(header_row)
         if not header_cells:
             logger.debug("responsive-table %d has no header cells; skipping", idx_c)
             continue
 
-        first_header = header_cells[0].get_text(" ", strip=True).lower()
+        first_header = _text(header_cells[0]).lower()
 
-        tbody = table.find("tbody") or table
-        trs = tbody.find_all("tr")
+        tbody = _first(table, "tbody")
+        trs = TABLE_ROWS_XPATH(tbody if tbody is not None else table)
 
         if first_header.startswith("in"):
             logger.debug(
@@ -334,9 +493,10 @@ def parse_transfers(html: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
                 club_name,
             )
             for tr in trs:
-                row = parse_transfer_row(tr, club_name, "in")
-                if row:
-                    in_rows.append(row)
+                values = _transfer_row_values(tr)
+                if values:
+                    in_clubs.append(club_name)
+                    in_rows.append(values)
 
         elif first_header.startswith("out"):
             logger.debug(
@@ -345,9 +505,10 @@ def parse_transfers(html: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
                 club_name,
             )
             for tr in trs:
-                row = parse_transfer_row(tr, club_name, "out")
-                if row:
-                    out_rows.append(row)
+                values = _transfer_row_values(tr)
+                if values:
+                    out_clubs.append(club_name)
+                    out_rows.append(values)
 
         else:
             logger.debug(
@@ -356,20 +517,8 @@ def parse_transfers(html: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
                 first_header,
             )
 
-    in_columns = ["Club", "In", "Age", "Nationality", "Position", "Market value", "Left", "Fee"]
-    out_columns = [
-        "Club",
-        "Out",
-        "Age",
-        "Nationality",
-        "Position",
-        "Market value",
-        "Joined",
-        "Fee",
-    ]
-
-    transfers_in_df = pd.DataFrame(in_rows, columns=in_columns)
-    transfers_out_df = pd.DataFrame(out_rows, columns=out_columns)
+    transfers_in_df = _transfers_frame(in_clubs, in_rows, TRANSFERS_IN_COLUMNS)
+    transfers_out_df = _transfers_frame(out_clubs, out_rows, TRANSFERS_OUT_COLUMNS)
 
     logger.info(
         "Parsed transfers_in shape=%s, columns=%s",
@@ -406,11 +555,9 @@ def run() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         "transfers/wettbewerb/GB2/saison_id/2024"
     )
 
-    league_html = fetch_html(league_url)
-    transfers_html = fetch_html(transfers_url)
-
-    league_df = parse_league_table(league_html)
-    transfers_in_df, transfers_out_df = parse_transfers(transfers_html)
+    # Parse the league page while the polite delay before the next fetch runs
+    league_df = parse_league_table(fetch_html(league_url))
+    transfers_in_df, transfers_out_df = parse_transfers(fetch_html(transfers_url))
 
     # Optional: keep local debug copies by uncommenting:
     # RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -426,9 +573,13 @@ def run() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     transfers_in_blob = f"{GCS_RAW_PREFIX}/transfermarkt_transfers_in_2024_25.csv"
     transfers_out_blob = f"{GCS_RAW_PREFIX}/transfermarkt_transfers_out_2024_25.csv"
 
-    upload_df_to_gcs(league_df, league_blob)
-    upload_df_to_gcs(transfers_in_df, transfers_in_blob)
-    upload_df_to_gcs(transfers_out_df, transfers_out_blob)
+    upload_dfs_to_gcs(
+        [
+            (league_df, league_blob),
+            (transfers_in_df, transfers_in_blob),
+            (transfers_out_df, transfers_out_blob),
+        ]
+    )
 
     logger.info(
         "Transfermarkt extract complete. "
@@ -446,4 +597,5 @@ def run() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
 
 
 if __name__ == "__main__":
+    ensure_data_dirs()
     run()
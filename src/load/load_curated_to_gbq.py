@@ -1,49 +1,75 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Dict
+
+from google.cloud import bigquery
 
 from src.config import GCS_BUCKET
 from src.utils.logging_utils import get_logger
-from src.utils.gcp import load_csv_to_bq, storage_client  # 👈 reuse existing client
+from src.utils.gcp import load_to_bq, get_storage_client  # 👈 reuse existing client
 
 logger = get_logger(__name__)
 
+# BigQuery source format per curated file suffix; Parquet wins when a table has both
+SOURCE_FORMATS = {
+    ".parquet": bigquery.SourceFormat.PARQUET,
+    ".csv": bigquery.SourceFormat.CSV,
+}
+
 
 def load_all_curated_to_bigquery_from_gcs(prefix: str = "curated") -> None:
     """
-    List all CSVs in gs://<bucket>/<prefix>/ and load each into a BigQuery table.
+    List all Parquet/CSV files in gs://<bucket>/<prefix>/ and load each into
+    a BigQuery table.
 
     Mapping example:
-        gs://<bucket>/curated/player_stats_semantic_2024_25.csv
+        gs://<bucket>/curated/player_stats_semantic_2024_25.parquet
             -> table 'player_stats_semantic_2024_25'
 
-        gs://<bucket>/curated/transfers_in_semantic_2024_25.csv
+        gs://<bucket>/curated/transfers_in_semantic_2024_25.parquet
             -> table 'transfers_in_semantic_2024_25'
 
-    Any additional CSVs you place under this prefix will also be loaded.
+    Any additional Parquet or CSV files you place under this prefix will also
+    be loaded. If a table exists as both (e.g. a CSV left over from older
+    runs), only the Parquet file is loaded.
     """
     # Ensure prefix ends with exactly one slash for listing
     effective_prefix = prefix.rstrip("/") + "/"
 
     logger.info(
-        "Listing curated CSVs in GCS bucket '%s' with prefix '%s'",
+        "Listing curated files in GCS bucket '%s' with prefix '%s'",
         GCS_BUCKET,
         effective_prefix,
     )
 
-    blobs = storage_client.list_blobs(GCS_BUCKET, prefix=effective_prefix)
+    blobs = get_storage_client().list_blobs(GCS_BUCKET, prefix=effective_prefix)
 
-    found_any = False
+    # table name -> blob name, preferring Parquet over CSV
+    sources: Dict[str, str] = {}
     for blob in blobs:
-        name = blob.name  # e.g. 'curated/player_stats_semantic_2024_25.csv'
+        name = blob.name  # e.g. 'curated/player_stats_semantic_2024_25.parquet'
+        filename = Path(name.split("/")[-1])  # 'player_stats_semantic_2024_25.parquet'
+        suffix = filename.suffix.lower()
 
-        # Skip "folders" and non-CSV objects
-        if not name.lower().endswith(".csv"):
+        # Skip "folders" and anything we don't know how to load
+        if suffix not in SOURCE_FORMATS:
             continue
 
-        found_any = True
-        filename = name.split("/")[-1]       # 'player_stats_semantic_2024_25.csv'
-        table_name = Path(filename).stem     # 'player_stats_semantic_2024_25'
+        table_name = filename.stem  # 'player_stats_semantic_2024_25'
+        current = sources.get(table_name)
+        if current is None or suffix == ".parquet":
+            sources[table_name] = name
+
+    if not sources:
+        logger.warning(
+            "No Parquet or CSV files found in gs://%s/%s", GCS_BUCKET, effective_prefix
+        )
+        return
+
+    # Start every load job first; they run server-side in parallel
+    jobs = {}
+    for table_name, name in sources.items():
         gcs_uri = f"gs://{GCS_BUCKET}/{name}"
 
         logger.info(
@@ -51,14 +77,18 @@ def load_all_curated_to_bigquery_from_gcs(prefix: str = "curated") -> None:
             gcs_uri,
             table_name,
         )
-        load_csv_to_bq(table_name=table_name, gcs_uri=gcs_uri)
-
-    if not found_any:
-        logger.warning(
-            "No CSV files found in gs://%s/%s", GCS_BUCKET, effective_prefix
+        jobs[table_name] = load_to_bq(
+            table_name=table_name,
+            gcs_uri=gcs_uri,
+            source_format=SOURCE_FORMATS[Path(name).suffix.lower()],
+            wait=False,
         )
-    else:
-        logger.info("Finished loading all curated CSVs into BigQuery.")
+
+    for table_name, job in jobs.items():
+        job.result()  # Wait for job to complete
+        logger.info("BigQuery load completed for table %s", table_name)
+
+    logger.info("Finished loading all curated files into BigQuery.")
 
 
 def main() -> None:
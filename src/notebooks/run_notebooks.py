@@ -1,8 +1,58 @@
+import os
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+def _run_one(nb: Path, reports_dir: Path, has_wkhtmltopdf: bool) -> None:
+    """
+    Execute one notebook, export it to HTML and optionally convert to PDF.
+    """
+    print(f"Executing notebook: {nb.name}")
+
+    html_output = reports_dir / f"{nb.stem}.html"
+
+    # Step 1 — Execute notebook and export to HTML with no code cells
+    try:
+        subprocess.run(
+            [
+                "jupyter",
+                "nbconvert",
+                "--to", "html",
+                "--execute",
+                "--no-input",              # hide code cells, keep outputs/markdown
+                "--output", html_output.name,
+                "--output-dir", str(reports_dir),
+                str(nb),
+            ],
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to execute/export {nb.name} to HTML: {e}")
+        return
+
+    print(f"  → HTML report written: {html_output}")
+
+    # Step 2 — Optionally convert HTML → PDF via wkhtmltopdf
+    if has_wkhtmltopdf:
+        pdf_output = reports_dir / f"{nb.stem}.pdf"
+        print(f"  Converting HTML to PDF: {pdf_output.name}")
+
+        try:
+            subprocess.run(
+                [
+                    "wkhtmltopdf",
+                    str(html_output),
+                    str(pdf_output),
+                ],
+                check=True,
+            )
+            print(f"  → PDF report written: {pdf_output}")
+        except subprocess.CalledProcessError as e:
+            print(f"  Failed to convert {html_output} to PDF: {e}")
+
+
 def main():
     """
     Execute notebooks in ROOT/notebooks/ and export reports into ROOT/reports.
@@ -40,49 +90,16 @@ def main():
     if not has_wkhtmltopdf:
         print("wkhtmltopdf not installed; generating HTML reports only.")
 
-    for nb in notebooks:
-        print(f"Executing notebook: {nb.name}")
-
-        html_output = reports_dir / f"{nb.stem}.html"
-
-        # Step 1 — Execute notebook and export to HTML with no code cells
-        try:
-            subprocess.run(
-                [
-                    "jupyter",
-                    "nbconvert",
-                    "--to", "html",
-                    "--execute",
-                    "--no-input",              # hide code cells, keep outputs/markdown
-                    "--output", html_output.name,
-                    "--output-dir", str(reports_dir),
-                    str(nb),
-                ],
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to execute/export {nb.name} to HTML: {e}")
-            continue
-
-        print(f"  → HTML report written: {html_output}")
-
-        # Step 2 — Optionally convert HTML → PDF via wkhtmltopdf
-        if has_wkhtmltopdf:
-            pdf_output = reports_dir / f"{nb.stem}.pdf"
-            print(f"  Converting HTML to PDF: {pdf_output.name}")
-
-            try:
-                subprocess.run(
-                    [
-                        "wkhtmltopdf",
-                        str(html_output),
-                        str(pdf_output),
-                    ],
-                    check=True,
-                )
-                print(f"  → PDF report written: {pdf_output}")
-            except subprocess.CalledProcessError as e:
-                print(f"  Failed to convert {html_output} to PDF: {e}")
+    # Each notebook runs in its own jupyter/wkhtmltopdf subprocess, so a
+    # thread pool is enough to run them side by side
+    max_workers = min(len(notebooks), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_run_one, nb, reports_dir, has_wkhtmltopdf)
+            for nb in notebooks
+        ]
+        for future in futures:
+            future.result()  # re-raise anything unexpected (e.g. jupyter missing)
 
     print("Notebook report generation complete.")
 
@@ -4,24 +4,24 @@ Build curated semantic tables for the 2024/25 Championship.
 Inputs (in GCS):
 
 - gs://<GCS_BUCKET>/fbref/championship_2024_25/raw/
-    * fbref_championship_player_standard_stats_2024_25.csv
-    * fbref_championship_squad_standard_stats_2024_25.csv
+    * fbref_championship_player_standard_stats_2024_25.parquet
+    * fbref_championship_squad_standard_stats_2024_25.parquet
 
 - gs://<GCS_BUCKET>/fbref/championship_2024_25/transform/
-    * fbref_championship_player_advanced_stats_2024_25.csv
+    * fbref_championship_player_advanced_stats_2024_25.parquet
 
 - gs://<GCS_BUCKET>/transfermarkt/championship_2024_25/raw/
     * transfermarkt_league_table_2024_25.csv
     * transfermarkt_transfers_in_2024_25.csv
     * transfermarkt_transfers_out_2024_25.csv
 
-Outputs (locally + in GCS under 'curated/'):
+Outputs (in GCS under 'curated/' as Parquet; optional local CSV copies):
 
-- player_stats_semantic_2024_25.csv
-- player_advanced_stats_2024_25.csv
-- transfers_in_semantic_2024_25.csv
-- transfers_out_semantic_2024_25.csv
-- league_table_enhanced_2024_25.csv
+- player_stats_semantic_2024_25.parquet
+- player_advanced_stats_2024_25.parquet
+- transfers_in_semantic_2024_25.parquet
+- transfers_out_semantic_2024_25.parquet
+- league_table_enhanced_2024_25.parquet
 """
 
 from __future__ import annotations
@@ -29,20 +29,21 @@ from __future__ import annotations
 from pathlib import Path
 import io
 import re
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
 import pandas as pd
-from google.cloud import storage
 
-from src.config import RAW_DATA_DIR, CURATED_DATA_DIR, GCS_BUCKET, GCP_PROJECT_ID
+from src.config import RAW_DATA_DIR, CURATED_DATA_DIR, GCS_BUCKET
 from src.utils.logging_utils import get_logger
 from src.utils.dim_club_24_25 import (
     load_dim_club,
     attach_club_id,
-    standardize_club_name,
+    canonical_club_names,
+    ALIAS_TO_CANONICAL,
 )
-from src.utils.dim_country import normalize_country
-from src.utils.gcp import upload_df_to_gcs  # cloud-first upload
+from src.utils.dim_country import normalize_country_series
+from src.utils.gcp import get_storage_client, upload_dfs_to_gcs  # shared client, cloud-first upload
 
 logger = get_logger(__name__)
 
@@ -69,48 +70,75 @@ FBREF_TRANSFORM_PREFIX_GCS = "fbref/championship_2024_25/transform"
 TM_RAW_PREFIX_GCS = "transfermarkt/championship_2024_25/raw"
 CURATED_PREFIX_GCS = "curated"  # where semantic outputs are written in the bucket
 
-_storage_client = storage.Client(project=GCP_PROJECT_ID)
-
 
 def read_csv_from_gcs(blob_name: str) -> pd.DataFrame:
     """
     Read a CSV from GCS into a DataFrame.
 
     blob_name: path within the bucket, e.g.
-      'fbref/championship_2024_25/raw/fbref_championship_player_standard_stats_2024_25.csv'
+      'transfermarkt/championship_2024_25/raw/transfermarkt_league_table_2024_25.csv'
     """
-    bucket = _storage_client.bucket(GCS_BUCKET)
+    bucket = get_storage_client().bucket(GCS_BUCKET)
     blob = bucket.blob(blob_name)
 
     logger.info("Reading CSV from gs://%s/%s", GCS_BUCKET, blob_name)
-    csv_text = blob.download_as_text(encoding="utf-8")
-    return pd.read_csv(io.StringIO(csv_text))
+    # Raw bytes straight into the C parser: no Python-level decode to str
+    csv_bytes = blob.download_as_bytes()
+    return pd.read_csv(
+        io.BytesIO(csv_bytes),
+        encoding="utf-8",
+        engine="pyarrow",
+    )
+
+
+def read_parquet_from_gcs(blob_name: str) -> pd.DataFrame:
+    """
+    Read a Parquet file from GCS into a DataFrame.
+
+    blob_name: path within the bucket, e.g.
+      'fbref/championship_2024_25/raw/fbref_championship_player_standard_stats_2024_25.parquet'
+    """
+    bucket = get_storage_client().bucket(GCS_BUCKET)
+    blob = bucket.blob(blob_name)
+
+    logger.info("Reading Parquet from gs://%s/%s", GCS_BUCKET, blob_name)
+    parquet_bytes = blob.download_as_bytes()
+    return pd.read_parquet(io.BytesIO(parquet_bytes), engine="pyarrow")
 
 
 # =========================================================
 # Helpers
 # =========================================================
 
-def parse_goals_for_against(value: str) -> Tuple[float, float]:
+# Exactly one ':' separating goals for and against, e.g. '95:30'
+GOALS_FOR_AGAINST_RE = re.compile(r"^([^:]*):([^:]*)$")
+
+
+def split_goals_for_against(goals: pd.Series) -> pd.DataFrame:
     """
-    Parse '95:30' -> (95.0, 30.0).
+    Parse a column of '95:30' strings into float goals_for / goals_against
+    columns; anything unparseable gives NaN for both.
     """
-    if not isinstance(value, str):
-        return float("nan"), float("nan")
-    parts = value.split(":")
-    if len(parts) != 2:
-        return float("nan"), float("nan")
-    try:
-        gf = float(parts[0])
-        ga = float(parts[1])
-    except ValueError:
-        gf, ga = float("nan"), float("nan")
-    return gf, ga
-
-
-def parse_transfer_fee_to_eur(value: str) -> float:
+    parts = goals.astype(str).str.extract(GOALS_FOR_AGAINST_RE)
+    out = pd.DataFrame(
+        {
+            "goals_for": pd.to_numeric(parts[0], errors="coerce"),
+            "goals_against": pd.to_numeric(parts[1], errors="coerce"),
+        },
+        index=goals.index,
+        dtype="float64",
+    )
+    return out.mask(out.isna().any(axis=1))
+
+
+# '€1.80m' / '€400k'-style amounts: number + optional m/k suffix
+FEE_AMOUNT_RE = re.compile(r"€\s*([\d\.]+)\s*([mk])?", flags=re.IGNORECASE)
+FEE_SUFFIX_MULTIPLIER = {"m": 1_000_000, "k": 1_000}
+
+
+def parse_transfer_fees_to_eur(fees: pd.Series) -> pd.Series:
     """
-    Parse Transfermarkt fee strings into a numeric EUR amount.
+    Parse a column of Transfermarkt fee strings into numeric EUR amounts.
 
     Examples:
         "€1.80m"           -> 1_800_000
@@ -119,40 +147,43 @@ def parse_transfer_fee_to_eur(value: str) -> float:
         "free transfer"    -> 0
         "-" or "?"         -> 0
         "End of loan ..."  -> 0 (returns are not new spending)
-    """
-    if not isinstance(value, str):
-        return 0.0
 
-    s = value.strip()
-    if not s or s in {"-", "?", "–"}:
-        return 0.0
+    Anything without a '€' amount (missing values, '-', '?', ...) is 0.
+    """
+    text = fees.astype(str).str.strip()
+    low = text.str.lower()
 
-    low = s.lower()
+    amount = text.str.extract(FEE_AMOUNT_RE)
+    number = pd.to_numeric(amount[0], errors="coerce")
+    multiplier = amount[1].str.lower().map(FEE_SUFFIX_MULTIPLIER).fillna(1)
 
-    # End of loan / internal adjustments -> treat as zero spend
-    if "end of loan" in low:
-        return 0.0
+    # End of loan / internal adjustments and free transfers -> zero spend
+    zero = low.str.contains("end of loan", regex=False) | (
+        low.str.contains("free", regex=False) & ~text.str.contains("€", regex=False)
+    )
 
-    if "free" in low and "€" not in s:
-        return 0.0
+    return (number * multiplier).mask(zero, 0.0).fillna(0.0)
 
-    # If there's a "Loan fee: €X", extract the €X part
-    if "loan fee" in low and "€" in s:
-        s = s[s.index("€"):].strip()
 
-    m = re.search(r"€\s*([\d\.]+)\s*([mk])?", s, flags=re.IGNORECASE)
-    if not m:
-        return 0.0
+# Repeated labels in the player / transfer tables; stored as categoricals
+PLAYER_LABEL_COLS = ("club", "position", "nationality")
+TRANSFER_LABEL_COLS = PLAYER_LABEL_COLS + ("from_club_name", "to_club_name")
 
-    number = float(m.group(1))
-    suffix = (m.group(2) or "").lower()
 
-    if suffix == "m":
-        return number * 1_000_000
-    if suffix == "k":
-        return number * 1_000
+def _shrink_df(df: pd.DataFrame, label_cols: Tuple[str, ...] = ()) -> pd.DataFrame:
+    """
+    Compact a semantic table in place: repeated labels (label_cols) become
+    categoricals and integer columns take the smallest integer dtype.
+    Floats are left as float64 so curated values keep full precision.
+    """
+    for col in label_cols:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
 
-    return number
+    int_cols = df.select_dtypes("integer").columns
+    if len(int_cols):
+        df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast="integer")
+    return df
 
 
 # =========================================================
@@ -166,49 +197,36 @@ def build_player_stats_semantic(dim_club: pd.DataFrame) -> pd.DataFrame:
 
     Source (GCS):
       gs://<GCS_BUCKET>/fbref/championship_2024_25/raw/
-        fbref_championship_player_standard_stats_2024_25.csv
+        fbref_championship_player_standard_stats_2024_25.parquet
     """
     blob_name = (
         f"{FBREF_RAW_PREFIX_GCS}/"
-        "fbref_championship_player_standard_stats_2024_25.csv"
+        "fbref_championship_player_standard_stats_2024_25.parquet"
     )
-    df = read_csv_from_gcs(blob_name)
+    df = read_parquet_from_gcs(blob_name)
 
     # FBRef column is usually 'nation' with ISO-like codes (e.g. "GAM", "CUW")
-    # Rename for consistency across tables
-    if "nation" in df.columns:
-        df.rename(columns={"nation": "nationality"}, inplace=True)
-    if "pos" in df.columns:
-        df.rename(columns={"pos": "position"}, inplace=True)
-    if "player" in df.columns:
-        df.rename(columns={"player": "player_name"}, inplace=True)
+    # Rename for consistency across tables (absent columns are skipped)
+    df = df.rename(
+        columns={"nation": "nationality", "pos": "position", "player": "player_name"}
+    )
 
     # Normalise nationality before attaching club_id / merging
     if "nationality" in df.columns:
-        df["nationality"] = df["nationality"].astype(str).apply(normalize_country)
+        df["nationality"] = normalize_country_series(df["nationality"])
 
     # Attach club_id based on FBRef 'squad' labels
     df = attach_club_id(df, col="squad", dim_club=dim_club)
 
     # Add canonical club name and drop raw squad label
-    df = df.merge(
-        dim_club[["club_id", "canonical_club_name"]],
-        on="club_id",
-        how="left",
-    )
-
-    df = df.rename(columns={"canonical_club_name": "club"})
-
-    if "squad" in df.columns:
-        df = df.drop(columns=["squad"])
+    df["club"] = df["club_id"].map(canonical_club_names(dim_club))
 
-    if "rk" in df.columns:
-        df = df.drop(columns=["rk"])
+    df = df.drop(columns=["squad", "rk"], errors="ignore")
 
     # Order: club_id, club near the front
     front_cols = ["club_id", "club"]
     other_cols = [c for c in df.columns if c not in front_cols]
-    df = df[front_cols + other_cols]
+    df = _shrink_df(df[front_cols + other_cols], PLAYER_LABEL_COLS)
 
     logger.info(
         "Built player_stats_semantic with shape=%s and columns=%s",
@@ -231,31 +249,25 @@ def build_player_advanced_semantic(
 
     Advanced stats source (GCS):
       gs://<GCS_BUCKET>/fbref/championship_2024_25/transform/
-        fbref_championship_player_advanced_stats_2024_25.csv
+        fbref_championship_player_advanced_stats_2024_25.parquet
     """
     adv_blob = (
         f"{FBREF_TRANSFORM_PREFIX_GCS}/"
-        "fbref_championship_player_advanced_stats_2024_25.csv"
+        "fbref_championship_player_advanced_stats_2024_25.parquet"
     )
-    adv = read_csv_from_gcs(adv_blob)
+    adv = read_parquet_from_gcs(adv_blob)
 
     # Advanced table currently has 'player' and 'squad'
-    if "player" in adv.columns:
-        adv.rename(columns={"player": "player_name"}, inplace=True)
+    adv = adv.rename(columns={"player": "player_name"})
 
     # Attach club_id based on FBRef 'squad' labels
     adv = attach_club_id(adv, col="squad", dim_club=dim_club)
 
     # Add canonical club name as 'club' (same as standard)
-    adv = adv.merge(
-        dim_club[["club_id", "canonical_club_name"]],
-        on="club_id",
-        how="left",
-    ).rename(columns={"canonical_club_name": "club"})
+    adv["club"] = adv["club_id"].map(canonical_club_names(dim_club))
 
     # We don't need 'squad' anymore after club_id/canonical handling
-    if "squad" in adv.columns:
-        adv = adv.drop(columns=["squad"])
+    adv = adv.drop(columns=["squad"], errors="ignore")
 
     # Ensure consistent column order for advanced table too:
     front_adv = ["club_id", "club", "player_name"]
@@ -270,7 +282,10 @@ def build_player_advanced_semantic(
         on=["club_id", "player_name"],
         how="left",
         suffixes=("", "_adv"),
+        # One advanced row per player: fail loudly rather than duplicate rows
+        validate="many_to_one",
     )
+    merged = _shrink_df(merged, PLAYER_LABEL_COLS)
 
     logger.info(
         "Built player_advanced_semantic with shape=%s and columns=%s",
@@ -304,27 +319,17 @@ def build_transfers_semantic(dim_club: pd.DataFrame) -> Tuple[pd.DataFrame, pd.D
     tout = attach_club_id(tout, col="Club", dim_club=dim_club)
 
     # Add canonical club name for the Championship club itself
-    tin = tin.merge(
-        dim_club[["club_id", "canonical_club_name"]],
-        on="club_id",
-        how="left",
-    ).rename(columns={"canonical_club_name": "club"})
-
-    tout = tout.merge(
-        dim_club[["club_id", "canonical_club_name"]],
-        on="club_id",
-        how="left",
-    ).rename(columns={"canonical_club_name": "club"})
+    canonical = canonical_club_names(dim_club)
+    tin["club"] = tin["club_id"].map(canonical)
+    tout["club"] = tout["club_id"].map(canonical)
 
     # Parse fees
-    tin["fee_eur"] = tin["Fee"].apply(parse_transfer_fee_to_eur)
-    tout["fee_eur"] = tout["Fee"].apply(parse_transfer_fee_to_eur)
+    tin["fee_eur"] = parse_transfer_fees_to_eur(tin["Fee"])
+    tout["fee_eur"] = parse_transfer_fees_to_eur(tout["Fee"])
 
     # Drop original 'Club' column (we now have canonical 'club')
-    if "Club" in tin.columns:
-        tin = tin.drop(columns=["Club"])
-    if "Club" in tout.columns:
-        tout = tout.drop(columns=["Club"])
+    tin = tin.drop(columns=["Club"], errors="ignore")
+    tout = tout.drop(columns=["Club"], errors="ignore")
 
     # Rename remaining columns for a cleaner schema
     tin = tin.rename(
@@ -355,33 +360,34 @@ def build_transfers_semantic(dim_club: pd.DataFrame) -> Tuple[pd.DataFrame, pd.D
 
     # Normalise nationality in transfers
     if "nationality" in tin.columns:
-        tin["nationality"] = tin["nationality"].astype(str).apply(normalize_country)
+        tin["nationality"] = normalize_country_series(tin["nationality"])
     if "nationality" in tout.columns:
-        tout["nationality"] = tout["nationality"].astype(str).apply(normalize_country)
+        tout["nationality"] = normalize_country_series(tout["nationality"])
 
     # --------------------------------------------------------
     # STANDARDISE from_club_name / to_club_name WHEN POSSIBLE
     # --------------------------------------------------------
 
-    def standardize_external_club(raw_name: str) -> str:
+    def standardize_external_club(names: pd.Series) -> pd.Series:
         """
         Replace with canonical Championship club name if available,
-        otherwise keep original raw string.
+        otherwise keep original raw string (non-strings pass through).
+        Looked up once per distinct name, then mapped back.
         """
-        if not isinstance(raw_name, str):
-            return raw_name
-        try:
-            return standardize_club_name(raw_name)
-        except KeyError:
-            return raw_name
+        mapping = {
+            raw: ALIAS_TO_CANONICAL.get(raw.strip(), raw)
+            for raw in names.dropna().unique()
+            if isinstance(raw, str)
+        }
+        return names.map(mapping).fillna(names)
 
     # Transfers IN
     if "from_club_name" in tin.columns:
-        tin["from_club_name"] = tin["from_club_name"].apply(standardize_external_club)
+        tin["from_club_name"] = standardize_external_club(tin["from_club_name"])
 
     # Transfers OUT
     if "to_club_name" in tout.columns:
-        tout["to_club_name"] = tout["to_club_name"].apply(standardize_external_club)
+        tout["to_club_name"] = standardize_external_club(tout["to_club_name"])
 
     # Reorder: club_id, club near the front
     def reorder(df: pd.DataFrame) -> pd.DataFrame:
@@ -389,8 +395,8 @@ def build_transfers_semantic(dim_club: pd.DataFrame) -> Tuple[pd.DataFrame, pd.D
         other = [c for c in df.columns if c not in front]
         return df[front + other]
 
-    tin = reorder(tin)
-    tout = reorder(tout)
+    tin = _shrink_df(reorder(tin), TRANSFER_LABEL_COLS)
+    tout = _shrink_df(reorder(tout), TRANSFER_LABEL_COLS)
 
     logger.info(
         "Built transfers_in_semantic with shape=%s, columns=%s",
@@ -427,24 +433,27 @@ def build_league_table_enhanced(
     league_blob = f"{TM_RAW_PREFIX_GCS}/transfermarkt_league_table_2024_25.csv"
     squad_blob = (
         f"{FBREF_RAW_PREFIX_GCS}/"
-        "fbref_championship_squad_standard_stats_2024_25.csv"
+        "fbref_championship_squad_standard_stats_2024_25.parquet"
     )
 
     league = read_csv_from_gcs(league_blob)
-    squad = read_csv_from_gcs(squad_blob)
+    squad = read_parquet_from_gcs(squad_blob)
 
     # Attach club_id based on league "club" labels
     league = attach_club_id(league, col="club", dim_club=dim_club)
 
-    # Parse numeric columns
-    for col in ["#", "played", "w", "d", "l", "gd", "pts"]:
-        if col in league.columns:
-            league[col] = pd.to_numeric(league[col], errors="coerce")
+    # Parse numeric columns. The Arrow reader types signed values ("+65") in
+    # 'gd' as double, so downcast back to integers wherever every value is
+    # whole; a column with unparseable cells stays float (NaN)
+    numeric_cols = [
+        c for c in ["#", "played", "w", "d", "l", "gd", "pts"] if c in league.columns
+    ]
+    league[numeric_cols] = league[numeric_cols].apply(
+        pd.to_numeric, errors="coerce", downcast="integer"
+    )
 
     if "goals" in league.columns:
-        gf, ga = zip(*league["goals"].map(parse_goals_for_against))
-        league["goals_for"] = gf
-        league["goals_against"] = ga
+        league[["goals_for", "goals_against"]] = split_goals_for_against(league["goals"])
 
     # Attach club_id to FBRef squad stats
     squad = attach_club_id(squad, col="squad", dim_club=dim_club)
@@ -456,16 +465,17 @@ def build_league_table_enhanced(
     )
 
     # Aggregate transfers by club_id
-    tin = transfers_in_sem.copy()
-    tout = transfers_out_sem.copy()
+    # (no copies: the callers' frames are only read, never mutated)
+    tin = transfers_in_sem
+    tout = transfers_out_sem
 
     if "fee_eur" not in tin.columns:
-        tin["fee_eur"] = 0.0
+        tin = tin.assign(fee_eur=0.0)
     if "fee_eur" not in tout.columns:
-        tout["fee_eur"] = 0.0
+        tout = tout.assign(fee_eur=0.0)
 
     tin_agg = (
-        tin.groupby("club_id", as_index=False)
+        tin.groupby("club_id", as_index=False, sort=False, observed=True)
         .agg(
             transfers_in_count=("player_name", "nunique"),
             transfers_in_fees=("fee_eur", "sum"),
@@ -473,7 +483,7 @@ def build_league_table_enhanced(
     )
 
     tout_agg = (
-        tout.groupby("club_id", as_index=False)
+        tout.groupby("club_id", as_index=False, sort=False, observed=True)
         .agg(
             transfers_out_count=("player_name", "nunique"),
             transfers_out_fees=("fee_eur", "sum"),
@@ -485,38 +495,39 @@ def build_league_table_enhanced(
         transfers_agg["transfers_in_fees"] - transfers_agg["transfers_out_fees"]
     )
 
-    # Attach canonical club name
-    clubs_small = dim_club[["club_id", "canonical_club_name"]]
-
-    # Final join: league + squad + transfers + canonical name
+    # Final join: league + squad + transfers, in one index-aligned pass
     enhanced = (
-        league
-        .merge(squad_prefixed, on="club_id", how="left")
-        .merge(transfers_agg, on="club_id", how="left")
-        .merge(clubs_small, on="club_id", how="left")
+        league.set_index("club_id")
+        .join(
+            [squad_prefixed.set_index("club_id"), transfers_agg.set_index("club_id")],
+            how="left",
+        )
+        .reset_index()
     )
 
     # Replace raw league 'club' with canonical 'club'
-    if "club" in enhanced.columns:
-        enhanced = enhanced.drop(columns=["club"])
+    enhanced = enhanced.drop(columns=["club"], errors="ignore")
 
-    enhanced = enhanced.rename(columns={"canonical_club_name": "club"})
+    enhanced["club"] = enhanced["club_id"].map(canonical_club_names(dim_club))
 
     # Fill NaNs for transfer metrics with 0
-    for col in [
-        "transfers_in_count",
-        "transfers_in_fees",
-        "transfers_out_count",
-        "transfers_out_fees",
-        "net_spend_eur",
-    ]:
-        if col in enhanced.columns:
-            enhanced[col] = enhanced[col].fillna(0.0)
+    fill_cols = [
+        c
+        for c in [
+            "transfers_in_count",
+            "transfers_in_fees",
+            "transfers_out_count",
+            "transfers_out_fees",
+            "net_spend_eur",
+        ]
+        if c in enhanced.columns
+    ]
+    enhanced[fill_cols] = enhanced[fill_cols].fillna(0.0)
 
     # Order: club_id, club near the front
     front = ["club_id", "club"]
     other = [c for c in enhanced.columns if c not in front]
-    enhanced = enhanced[front + other]
+    enhanced = _shrink_df(enhanced[front + other])
 
     logger.info(
         "Built league_table_enhanced with shape=%s and columns=%s",
@@ -531,70 +542,74 @@ def build_league_table_enhanced(
 # Main orchestrator
 # =========================================================
 
+def _curated_blob(local_path: Path) -> str:
+    """
+    GCS blob for a curated table: same stem as the (optional) local CSV,
+    stored as Parquet so types survive into BigQuery.
+    """
+    return f"{CURATED_PREFIX_GCS}/{local_path.stem}.parquet"
+
+
 def main() -> None:
     ensure_curated_dir()
 
     # 0) Load dim_club (from CSV, or build+write it if missing)
     dim_club = load_dim_club()
+    # Small integer keys: every later merge on club_id inherits this dtype
+    dim_club["club_id"] = pd.to_numeric(dim_club["club_id"], downcast="unsigned")
     logger.info("Loaded dim_club with %d rows", len(dim_club))
 
-    # 1) Player stats semantic (standard)
-    player_sem = build_player_stats_semantic(dim_club)
-    player_path = CURATED_DIR / "player_stats_semantic_2024_25.csv"
-    # Optional local write for debugging:
-    #player_sem.to_csv(player_path, index=False)
-    # Cloud-first upload:
-    upload_df_to_gcs(player_sem, f"{CURATED_PREFIX_GCS}/{player_path.name}")
-    logger.info(
-        "Player stats semantic written locally to %s and uploaded to gs://%s/%s",
-        player_path,
-        GCS_BUCKET,
-        f"{CURATED_PREFIX_GCS}/{player_path.name}",
-    )
+    # The player chain (1, 1b) and the transfers -> league chain (2, 3) do
+    # not depend on each other, so their GCS reads and parsing overlap
+    def build_player_tables() -> Tuple[pd.DataFrame, pd.DataFrame]:
+        # 1) Player stats semantic (standard)
+        player_sem = build_player_stats_semantic(dim_club)
+        # 1b) Player advanced stats semantic (standard + advanced merged)
+        player_adv_sem = build_player_advanced_semantic(dim_club, player_sem)
+        return player_sem, player_adv_sem
+
+    def build_transfer_tables() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        # 2) Transfers semantic
+        transfers_in_sem, transfers_out_sem = build_transfers_semantic(dim_club)
+        # 3) League table enhanced
+        league_enhanced = build_league_table_enhanced(
+            dim_club=dim_club,
+            transfers_in_sem=transfers_in_sem,
+            transfers_out_sem=transfers_out_sem,
+        )
+        return transfers_in_sem, transfers_out_sem, league_enhanced
 
-    # 1b) Player advanced stats semantic (standard + advanced merged)
-    player_adv_sem = build_player_advanced_semantic(dim_club, player_sem)
-    player_adv_path = CURATED_DIR / "player_advanced_stats_2024_25.csv"
-    #player_adv_sem.to_csv(player_adv_path, index=False)
-    upload_df_to_gcs(
-        player_adv_sem, f"{CURATED_PREFIX_GCS}/{player_adv_path.name}"
-    )
-    logger.info(
-        "Player advanced stats semantic written locally to %s and uploaded to gs://%s/%s",
-        player_adv_path,
-        GCS_BUCKET,
-        f"{CURATED_PREFIX_GCS}/{player_adv_path.name}",
-    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        player_future = pool.submit(build_player_tables)
+        transfer_future = pool.submit(build_transfer_tables)
+        player_sem, player_adv_sem = player_future.result()
+        transfers_in_sem, transfers_out_sem, league_enhanced = transfer_future.result()
 
-    # 2) Transfers semantic
-    transfers_in_sem, transfers_out_sem = build_transfers_semantic(dim_club)
+    player_path = CURATED_DIR / "player_stats_semantic_2024_25.csv"
+    player_adv_path = CURATED_DIR / "player_advanced_stats_2024_25.csv"
     tin_path = CURATED_DIR / "transfers_in_semantic_2024_25.csv"
     tout_path = CURATED_DIR / "transfers_out_semantic_2024_25.csv"
+    league_path = CURATED_DIR / "league_table_enhanced_2024_25.csv"
+    # Optional local writes for debugging:
+    #player_sem.to_csv(player_path, index=False)
+    #player_adv_sem.to_csv(player_adv_path, index=False)
     #transfers_in_sem.to_csv(tin_path, index=False)
     #transfers_out_sem.to_csv(tout_path, index=False)
-    upload_df_to_gcs(transfers_in_sem, f"{CURATED_PREFIX_GCS}/{tin_path.name}")
-    upload_df_to_gcs(transfers_out_sem, f"{CURATED_PREFIX_GCS}/{tout_path.name}")
-    logger.info(
-        "Transfers semantic written locally to %s, %s and uploaded to GCS",
-        tin_path,
-        tout_path,
-    )
-
-    # 3) League table enhanced
-    league_enhanced = build_league_table_enhanced(
-        dim_club=dim_club,
-        transfers_in_sem=transfers_in_sem,
-        transfers_out_sem=transfers_out_sem,
-    )
-    league_path = CURATED_DIR / "league_table_enhanced_2024_25.csv"
     #league_enhanced.to_csv(league_path, index=False)
-    upload_df_to_gcs(league_enhanced, f"{CURATED_PREFIX_GCS}/{league_path.name}")
-    logger.info(
-        "League table enhanced written locally to %s and uploaded to gs://%s/%s",
-        league_path,
-        GCS_BUCKET,
-        f"{CURATED_PREFIX_GCS}/{league_path.name}",
-    )
+
+    # Curated tables, uploaded together at the end
+    uploads: List[Tuple[pd.DataFrame, str]] = [
+        (player_sem, _curated_blob(player_path)),
+        (player_adv_sem, _curated_blob(player_adv_path)),
+        (transfers_in_sem, _curated_blob(tin_path)),
+        (transfers_out_sem, _curated_blob(tout_path)),
+        (league_enhanced, _curated_blob(league_path)),
+    ]
+
+    # Cloud-first upload: one concurrent batch for all curated tables
+    upload_dfs_to_gcs(uploads)
+    for _, blob_name in uploads:
+        logger.info("Curated table uploaded to gs://%s/%s", GCS_BUCKET, blob_name)
 
     logger.info("Curated semantic build complete.")
 
@@ -12,6 +12,7 @@ From this we generate:
     - alias → canonical lookup
     - standardize_club_name()
     - attach_club_id() for any dataframe
+    - canonical_club_names() club_id lookup
 
 When run directly, this script writes:
     data/utils/dim_club_2024_25.csv
@@ -115,18 +116,15 @@ def build_dim_club() -> pd.DataFrame:
       - aliases
       - club_key (slug)
     """
-    rows = []
-    for idx, (canonical, aliases) in enumerate(CANONICAL_TO_ALIASES.items(), start=1):
-        rows.append(
-            {
-                "club_id": idx,
-                "canonical_club_name": canonical,
-                "aliases": ", ".join(aliases),
-                "club_key": canonical.lower().replace(" ", "-"),
-            }
-        )
-
-    df = pd.DataFrame(rows)
+    canonicals = list(CANONICAL_TO_ALIASES)
+    df = pd.DataFrame(
+        {
+            "club_id": range(1, len(canonicals) + 1),
+            "canonical_club_name": canonicals,
+            "aliases": [", ".join(CANONICAL_TO_ALIASES[c]) for c in canonicals],
+            "club_key": [c.lower().replace(" ", "-") for c in canonicals],
+        }
+    )
     logger.info("Built dim_club with %d rows", len(df))
     return df
 
@@ -167,17 +165,20 @@ def attach_club_id(df: pd.DataFrame, col: str, dim_club: pd.DataFrame) -> pd.Dat
         logger.warning("Column %r missing, returning unchanged.", col)
         return df
 
-    tmp = df.copy()
+    # Resolve each distinct label once (labels repeat on every player row);
+    # standardize_club_name still raises on anything unknown
+    codes, labels = pd.factorize(df[col], use_na_sentinel=False)
+    canonical_to_id = dim_club.set_index("canonical_club_name")["club_id"]
+    label_ids = canonical_to_id.reindex([standardize_club_name(raw) for raw in labels])
 
-    tmp["canonical_club_name"] = tmp[col].apply(standardize_club_name)
+    return df.assign(club_id=label_ids.to_numpy()[codes])
 
-    tmp = tmp.merge(
-        dim_club[["club_id", "canonical_club_name"]],
-        on="canonical_club_name",
-        how="left",
-    )
 
-    return tmp.drop(columns=["canonical_club_name"])
+def canonical_club_names(dim_club: pd.DataFrame) -> pd.Series:
+    """
+    club_id -> canonical_club_name lookup, for df["club_id"].map(...).
+    """
+    return dim_club.set_index("club_id")["canonical_club_name"]
 
 
 # ============================================================
@@ -146,6 +146,7 @@ RAW_TO_CANONICAL = {
     "gre": "Greece",
     "grn": "Grenada",
     "gua": "Guatemala",
+    "hai": "Haiti",
     "hun": "Hungary",
     "isl": "Iceland",
     "isr": "Israel",
@@ -180,6 +181,66 @@ RAW_TO_CANONICAL = {
     "ukr": "Ukraine",
     "zim": "Zimbabwe",
 
+    # FIFA codes that are not ISO alpha-3. Codes under four characters never
+    # reach pycountry's fuzzy search, so each one needs an explicit alias
+    "ant": "Antigua and Barbuda",
+    "aru": "Aruba",
+    "bah": "Bahamas",
+    "bar": "Barbados",
+    "bhu": "Bhutan",
+    "bot": "Botswana",
+    "bru": "Brunei Darussalam",
+    "cay": "Cayman Islands",
+    "cha": "Chad",
+    "crc": "Costa Rica",
+    "cta": "Central African Republic",
+    "eqg": "Equatorial Guinea",
+    "esa": "El Salvador",
+    "fij": "Fiji",
+    "hon": "Honduras",
+    "ina": "Indonesia",
+    "iri": "Iran, Islamic Republic of",
+    "ksa": "Saudi Arabia",
+    "kuw": "Kuwait",
+    "kvx": "Kosovo",
+    "lat": "Latvia",
+    "lba": "Libya",
+    "les": "Lesotho",
+    "lib": "Lebanon",
+    "mad": "Madagascar",
+    "mas": "Malaysia",
+    "maw": "Malawi",
+    "mtn": "Mauritania",
+    "mya": "Myanmar",
+    "nca": "Nicaragua",
+    "nep": "Nepal",
+    "nig": "Niger",
+    "oma": "Oman",
+    "par": "Paraguay",
+    "phi": "Philippines",
+    "ple": "Palestine",
+    "pur": "Puerto Rico",
+    "sam": "Samoa",
+    "sey": "Seychelles",
+    "sin": "Singapore",
+    "skn": "Saint Kitts and Nevis",
+    "slo": "Slovenia",
+    "sol": "Solomon Islands",
+    "sri": "Sri Lanka",
+    "sud": "Sudan",
+    "tah": "Tahiti",
+    "tan": "Tanzania",
+    "tga": "Tonga",
+    "tog": "Togo",
+    "tpe": "Chinese Taipei",
+    "tri": "Trinidad and Tobago",
+    "uae": "United Arab Emirates",
+    "uru": "Uruguay",
+    "van": "Vanuatu",
+    "vie": "Viet Nam",
+    "vin": "Saint Vincent and the Grenadines",
+    "zam": "Zambia",
+
     # Saint Kitts and Nevis
     "saint kitts and nevis": "Saint Kitts and Nevis",
     "st. kitts & nevis": "Saint Kitts and Nevis",
@@ -197,6 +258,11 @@ def _normalize_via_pycountry(raw: str) -> Optional[str]:
 
     s = raw.strip()
 
+    # Noise (single characters, digits, punctuation) never names a country;
+    # reject it before the pycountry lookups and the slow fuzzy search
+    if len(s) < 2 or not any(ch.isalpha() for ch in s):
+        return None
+
     # alpha-3
     c = pycountry.countries.get(alpha_3=s.upper())
     if c:
@@ -214,7 +280,9 @@ def _normalize_via_pycountry(raw: str) -> Optional[str]:
     except Exception:
         pass
 
-    # fuzzy
+    # fuzzy (short codes that missed above only produce arbitrary matches)
+    if len(s) < 4:
+        return None
     try:
         matches = pycountry.countries.search_fuzzy(s)
         if matches:
@@ -232,6 +300,11 @@ def normalize_country(value: str) -> str:
     if not isinstance(value, str):
         value = str(value)
 
+    return _normalize_country_str(value)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_country_str(value: str) -> str:
     raw = value.strip()
     if not raw:
         return raw
@@ -254,4 +327,10 @@ def normalize_country(value: str) -> str:
 
 
 def normalize_country_series(series):
-    return series.apply(normalize_country)
+    """
+    Normalise a whole column, calling normalize_country once per distinct
+    value and mapping the results back (nationalities repeat heavily).
+    Missing values stay missing.
+    """
+    mapping = {raw: normalize_country(raw) for raw in series.dropna().unique()}
+    return series.map(mapping)
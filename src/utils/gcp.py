@@ -1,8 +1,14 @@
+import io
+import os
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, List, Tuple
 
 import pandas as pd  # NEW
 
 from google.cloud import storage, bigquery
+from google.cloud.storage import transfer_manager
+from google.cloud.storage.retry import DEFAULT_RETRY
 from google.api_core.exceptions import Conflict, NotFound
 
 from src.config import GCP_PROJECT_ID, GCS_BUCKET, BQ_DATASET
@@ -10,29 +16,44 @@ from src.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
-storage_client = storage.Client(project=GCP_PROJECT_ID)
-bq_client = bigquery.Client(project=GCP_PROJECT_ID)
+
+# -------------------------------------------------------
+# Shared clients (created on first use, so importing this module needs no
+# credentials and pays no client set-up)
+# -------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def get_storage_client() -> storage.Client:
+    return storage.Client(project=GCP_PROJECT_ID)
+
+
+@lru_cache(maxsize=None)
+def get_bq_client() -> bigquery.Client:
+    return bigquery.Client(project=GCP_PROJECT_ID)
 
 
 # -------------------------------------------------------
 # Ensure GCS bucket exists
 # -------------------------------------------------------
 
+@lru_cache(maxsize=None)
 def ensure_bucket_exists(bucket_name: str, location: str = "europe-west2"):
     """
     Ensure the GCS bucket exists.
 
     - If it exists -> return it
     - If it does not exist -> create it in GCP_PROJECT_ID
+
+    Cached per process: only the first upload pays the lookup round trip.
     """
-    bucket = storage_client.lookup_bucket(bucket_name)
+    bucket = get_storage_client().lookup_bucket(bucket_name)
 
     if bucket is not None:
         logger.info(f"GCS bucket '{bucket_name}' already exists.")
         return bucket
 
     logger.info(f"Creating GCS bucket '{bucket_name}' in {location}...")
-    bucket = storage_client.bucket(bucket_name)
+    bucket = get_storage_client().bucket(bucket_name)
     bucket.storage_class = "STANDARD"
 
     try:
@@ -43,7 +64,7 @@ def ensure_bucket_exists(bucket_name: str, location: str = "europe-west2"):
             f"Bucket '{bucket_name}' appeared between lookup and create; "
             "re-fetching existing bucket."
         )
-        bucket = storage_client.bucket(bucket_name)
+        bucket = get_storage_client().bucket(bucket_name)
 
     logger.info(f"GCS bucket '{bucket_name}' created successfully.")
     return bucket
@@ -53,17 +74,20 @@ def ensure_bucket_exists(bucket_name: str, location: str = "europe-west2"):
 # Ensure BigQuery dataset exists
 # -------------------------------------------------------
 
+@lru_cache(maxsize=None)
 def ensure_dataset_exists(dataset_id: str, location: str = "europe-west2") -> bigquery.Dataset:
     """
     Ensure the BigQuery dataset exists.
 
     - If it exists -> return it
     - If it does not exist -> create it in GCP_PROJECT_ID
+
+    Cached per process, like ensure_bucket_exists.
     """
     full_id = f"{GCP_PROJECT_ID}.{dataset_id}"
 
     try:
-        dataset = bq_client.get_dataset(full_id)
+        dataset = get_bq_client().get_dataset(full_id)
         logger.info("BigQuery dataset '%s' already exists.", full_id)
         return dataset
     except NotFound:
@@ -73,12 +97,12 @@ def ensure_dataset_exists(dataset_id: str, location: str = "europe-west2") -> bi
     dataset.location = location
 
     try:
-        dataset = bq_client.create_dataset(dataset)
+        dataset = get_bq_client().create_dataset(dataset)
     except Conflict:
         logger.info(
             "Dataset '%s' appeared between get and create; re-fetching.", full_id
         )
-        dataset = bq_client.get_dataset(full_id)
+        dataset = get_bq_client().get_dataset(full_id)
 
     logger.info("BigQuery dataset '%s' is ready.", full_id)
     return dataset
@@ -96,58 +120,132 @@ def upload_file_to_gcs(local_path: Path, gcs_blob_name: str) -> None:
     blob = bucket.blob(gcs_blob_name)
 
     logger.info(f"Uploading {local_path} → gs://{GCS_BUCKET}/{gcs_blob_name}")
-    blob.upload_from_filename(str(local_path))
+    # chunk_size=None: files under 8MB go up as a single multipart request,
+    # skipping the resumable-session round trips. Overwrites are idempotent,
+    # so retry unconditionally.
+    blob.chunk_size = None
+    blob.upload_from_filename(
+        os.fspath(local_path),
+        checksum="crc32c",
+        retry=DEFAULT_RETRY,
+    )
+
+
+def _content_type_for(gcs_blob_name: str) -> str:
+    if gcs_blob_name.lower().endswith(".parquet"):
+        return "application/vnd.apache.parquet"
+    return "text/csv"
+
+
+def write_df(df: pd.DataFrame, file_obj: BinaryIO, gcs_blob_name: str) -> str:
+    """
+    Write a DataFrame into a binary file object, picking the format from the
+    blob suffix: '.parquet' -> Parquet (pyarrow, zstd), anything else -> CSV.
+
+    Returns the matching content type.
+    """
+    content_type = _content_type_for(gcs_blob_name)
+    if content_type == "text/csv":
+        df.to_csv(file_obj, index=False, encoding="utf-8")
+    else:
+        df.to_parquet(file_obj, index=False, engine="pyarrow", compression="zstd")
+    return content_type
 
 
 def upload_df_to_gcs(df: pd.DataFrame, gcs_blob_name: str) -> None:
     """
-    Upload a pandas DataFrame as CSV directly to GCS, without writing to disk.
+    Upload a pandas DataFrame directly to GCS, without writing to disk.
+    Written as Parquet if the blob name ends in '.parquet', otherwise as CSV.
+
+    The serializer writes straight into the blob's upload stream, so the
+    full payload is never held in memory as one string.
     """
     bucket = ensure_bucket_exists(GCS_BUCKET)
     blob = bucket.blob(gcs_blob_name)
 
     logger.info("Uploading DataFrame → gs://%s/%s", GCS_BUCKET, gcs_blob_name)
-    csv_data = df.to_csv(index=False)
-    blob.upload_from_string(csv_data, content_type="text/csv")
+    with blob.open(
+        "wb", ignore_flush=True, content_type=_content_type_for(gcs_blob_name)
+    ) as f:
+        write_df(df, f, gcs_blob_name)
+
+
+def upload_dfs_to_gcs(
+    df_blob_pairs: List[Tuple[pd.DataFrame, str]],
+    max_workers: int = 4,
+) -> None:
+    """
+    Upload several DataFrames to GCS in one batched call (format per blob
+    suffix, as in upload_df_to_gcs).
+
+    Uses transfer_manager.upload_many so the uploads run concurrently on a
+    thread pool sharing the same authenticated client.
+    """
+    bucket = ensure_bucket_exists(GCS_BUCKET)
+
+    file_blob_pairs = []
+    for df, gcs_blob_name in df_blob_pairs:
+        logger.info("Uploading DataFrame → gs://%s/%s", GCS_BUCKET, gcs_blob_name)
+        buffer = io.BytesIO()
+        blob = bucket.blob(gcs_blob_name)
+        blob.content_type = write_df(df, buffer, gcs_blob_name)
+        buffer.seek(0)
+        file_blob_pairs.append((buffer, blob))
+
+    transfer_manager.upload_many(
+        file_blob_pairs,
+        worker_type=transfer_manager.THREAD,
+        max_workers=max_workers,
+        raise_exception=True,
+    )
 
 
 # -------------------------------------------------------
-# Load CSV from GCS into BigQuery
+# Load CSV / Parquet from GCS into BigQuery
 # -------------------------------------------------------
 
-def load_csv_to_bq(
+def load_to_bq(
     table_name: str,
     gcs_uri: str,
+    source_format: str = bigquery.SourceFormat.CSV,
     write_disposition: str = "WRITE_TRUNCATE",
-) -> None:
+    wait: bool = True,
+) -> bigquery.LoadJob:
     """
-    Load a CSV from GCS into a BigQuery table.
+    Load a CSV or Parquet file from GCS into a BigQuery table.
 
     - table_name: name of the table *inside* BQ_DATASET
     - gcs_uri: gs://... path to the file
+    - source_format: bigquery.SourceFormat.CSV or .PARQUET; Parquet carries
+      its own schema, CSV is autodetected
+    - wait: block until the job finishes; pass False to start several loads
+      and call .result() on the returned jobs afterwards
     """
     # Make sure dataset exists first
     ensure_dataset_exists(BQ_DATASET)
 
-    dataset_ref = bq_client.dataset(BQ_DATASET)
+    dataset_ref = get_bq_client().dataset(BQ_DATASET)
     table_ref = dataset_ref.table(table_name)
 
     job_config = bigquery.LoadJobConfig(
-        source_format=bigquery.SourceFormat.CSV,
-        skip_leading_rows=1,
-        autodetect=True,
+        source_format=source_format,
         write_disposition=write_disposition,
-        field_delimiter=",",
-        encoding="UTF-8",
     )
+    if source_format == bigquery.SourceFormat.CSV:
+        job_config.skip_leading_rows = 1
+        job_config.autodetect = True
+        job_config.field_delimiter = ","
+        job_config.encoding = "UTF-8"
 
     logger.info(
         f"Loading {gcs_uri} into {GCP_PROJECT_ID}.{BQ_DATASET}.{table_name}"
     )
-    load_job = bq_client.load_table_from_uri(
+    load_job = get_bq_client().load_table_from_uri(
         gcs_uri,
         table_ref,
         job_config=job_config,
     )
-    load_job.result()  # Wait for job to complete
-    logger.info(f"BigQuery load completed for table {table_name}")
+    if wait:
+        load_job.result()  # Wait for job to complete
+        logger.info(f"BigQuery load completed for table {table_name}")
+    return load_job
@@ -1,36 +1,41 @@
 #Paste this in a Jupyter notebook cell to explore the structure of the league table HTML.
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 
 url = "https://www.transfermarkt.co.uk/championship/tabelle/wettbewerb/GB2/saison_id/2024"
 headers = {"User-Agent": "Mozilla/5.0 (compatible; mini-pipeline/1.0)"}
 
-html = requests.get(url, headers=headers).text
-soup = BeautifulSoup(html, "lxml")
+html = requests.get(url, headers=headers).content
+doc = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+
+def get_text(el):
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
 
 # --- find the main table ---
-holder = soup.find("div", id="yw1")
-table = holder.find("table")
+table = doc.xpath('//div[@id="yw1"]//table')[0]
 
 print("=== THEAD STRUCTURE ===")
 thead = table.find("thead")
-print(thead.prettify())
+print(etree.tostring(thead, pretty_print=True, encoding="unicode"))
 
 # --- find the first real row ---
 tbody = table.find("tbody")
 first_row = tbody.find("tr")
 
 print("\n=== FIRST ROW (full HTML) ===")
-print(first_row.prettify())
+print(etree.tostring(first_row, pretty_print=True, encoding="unicode"))
 
 # --- list each <td>'s raw text value ---
 print("\n=== ORDERED <td> TEXT CONTENTS ===")
-tds = first_row.find_all("td")
+tds = first_row.findall(".//td")
 for i, td in enumerate(tds):
-    print(f"[{i}] => {td.get_text(' ', strip=True)}")
+    print(f"[{i}] => {get_text(td)}")
 
 # --- list each <td>'s class structure ---
 print("\n=== ORDERED <td> CLASSES ===")
 for i, td in enumerate(tds):
-    print(f"[{i}] => {td.get('class')}")
+    print(f"[{i}] => {td.get('class', '').split() or None}")
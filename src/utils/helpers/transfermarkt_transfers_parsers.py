@@ -1,22 +1,27 @@
 #Paste this in a Jupyter notebook cell to explore the structure of the league table HTML.
 
-from bs4 import BeautifulSoup
+import lxml.html
 import requests
+from lxml import etree
 
 URL = "https://www.transfermarkt.co.uk/championship/transfers/wettbewerb/GB2/saison_id/2024"
-html = requests.get(URL, headers={"User-Agent": "mini-championship-pipeline/1.0"}).text
-soup = BeautifulSoup(html, "lxml")
+html = requests.get(URL, headers={"User-Agent": "mini-championship-pipeline/1.0"}).content
+doc = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+
+def get_text(el):
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
 
 # Find the first 'In' table
-for container in soup.find_all("div", class_="responsive-table"):
-    h2 = container.find_previous("h2")
-    club = h2.get_text(" ", strip=True) if h2 else "?"
-    table = container.find("table")
-    thead = table.find("thead")
-    header_texts = [th.get_text(" ", strip=True) for th in thead.find_all("th")]
+for container in doc.xpath('//div[contains(concat(" ", @class, " "), " responsive-table ")]'):
+    h2 = container.xpath("preceding::h2[1]")
+    club = get_text(h2[0]) if h2 else "?"
+    table = container.find(".//table")
+    header_texts = [get_text(th) for th in table.iterfind(".//thead//th")]
     if any(h.strip().lower().startswith("in") for h in header_texts):
         print("Club:", club)
         print("Headers:", header_texts)
-        first_body_row = table.find("tbody").find("tr")
-        print(first_body_row.prettify())
+        first_body_row = table.find(".//tbody/tr")
+        print(etree.tostring(first_body_row, pretty_print=True, encoding="unicode"))
         break
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from src.extract.fbref_championship import merge_advanced_features
+
+
+def test_merge_advanced_features_tolerates_duplicate_player_squad():
+    # FBRef can list two players with the same name in one squad
+    passing = pd.DataFrame(
+        {
+            "player": ["Sam Smith", "Sam Smith", "Joe Bloggs"],
+            "squad": ["Hull City", "Hull City", "Leeds United"],
+            "passes_completed": [10, 20, 30],
+        }
+    )
+    shooting = pd.DataFrame(
+        {
+            "player": ["Sam Smith", "Ian Wright"],
+            "squad": ["Hull City", "Millwall"],
+            "shots": [1, 2],
+        }
+    )
+
+    merged = merge_advanced_features([passing, shooting])
+
+    assert list(merged.columns) == ["player", "squad", "passes_completed", "shots"]
+    assert len(merged) == 4
+    hull = merged[merged["squad"] == "Hull City"]
+    assert sorted(hull["passes_completed"]) == [10, 20]
+    assert hull["shots"].tolist() == [1, 1]
+    assert merged.loc[merged["player"] == "Ian Wright", "passes_completed"].isna().all()